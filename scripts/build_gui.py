@@ -7,19 +7,30 @@ HIC系统构建系统 - GTK GUI模式
 支持多语言、主题切换、配置预设
 """
 
+from __future__ import annotations
+
 import sys
 import os
+import io
+import codecs
 import subprocess
 import threading
-import json
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Sequence
+import hashlib
+import pickle
+import re
+import shlex
+import shutil
+import signal
+from ctypes.util import find_library
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
 
 try:
     import gi
     gi.require_version('Gtk', '3.0')
-    from gi.repository import Gtk, GLib, Pango, Gdk, GObject
+    from gi.repository import Gtk, Gio, GLib, GObject
 except ImportError:
     print("错误: 缺少 GTK3 库")
     print("请安装以下依赖:")
@@ -35,6 +46,83 @@ ROOT_DIR = Path(__file__).parent.parent
 BUILD_DIR = ROOT_DIR / "build"
 OUTPUT_DIR = ROOT_DIR / "output"
 PLATFORM_YAML = ROOT_DIR / "platform.yaml"
+CONFIG_FILE = ROOT_DIR / "build_config.mk"
+UI_FILE = Path(__file__).with_suffix(".ui")
+
+# 宿主环境探测（运行期间不会变化，启动时检测一次）
+HAS_NCURSES = bool(find_library("ncursesw") or find_library("ncurses"))
+IS_ARCH = os.path.exists("/etc/arch-release")
+
+# 子进程输出管道：单次读取大小与内核管道容量
+PIPE_READ_SIZE = io.DEFAULT_BUFFER_SIZE * 16
+PIPE_SIZE = 1 << 20
+
+# Linux F_SETPIPE_SZ（Python 3.10 之前fcntl模块未导出该常量）
+F_SETPIPE_SZ = 1031
+
+# 输出到管道时C程序默认整块缓冲，用stdbuf改为按行刷新（设置会被make的子进程继承）
+LINE_BUFFERED = ("stdbuf", "-oL", "-eL") if shutil.which("stdbuf") else ()
+
+# 构建日志视图保留的最大行数
+LOG_MAX_LINES = 5000
+
+# 用户缓存目录（翻译解析结果等）
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "hic"
+
+def _yaml_load(stream):
+    """安全加载YAML，优先使用libyaml实现的CSafeLoader"""
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+
+def _load_yaml_section(path: Path, name: str):
+    """只解析YAML文件中名为name的顶层一节，不存在时返回None"""
+    header = f"{name}:"
+    section = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if section is None:
+                if line.startswith(header):
+                    section = [line]
+            elif line[:1] in (" ", "\t", "\n", "\r", "#", ""):
+                # 缩进行、空行和注释仍属于本节
+                section.append(line)
+            else:
+                # 下一个顶层键，本节结束
+                break
+    if section is None:
+        return None
+    return (_yaml_load("".join(section)) or {}).get(name)
+
+
+def _translations_cache_file(translations_dir: Path) -> Path:
+    """按翻译文件的名称、大小和修改时间生成缓存文件路径"""
+    stamp = []
+    with os.scandir(translations_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".yaml"):
+                st = entry.stat()
+                stamp.append((entry.name, st.st_size, st.st_mtime_ns))
+    stamp.sort()
+    key = hashlib.blake2b(repr(stamp).encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"translations-{key}.pkl"
+
+
+def _write_translations_cache(cache_file: Path, result):
+    """写入翻译缓存并删除过期的缓存，失败时忽略"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        for old in cache_file.parent.glob("translations-*.pkl"):
+            if old != cache_file:
+                old.unlink()
+    except OSError:
+        pass
+
 
 # 翻译加载函数
 def load_translations():
@@ -42,42 +130,63 @@ def load_translations():
     translations_dir = Path(__file__).parent / "translations"
     
     try:
-        import yaml
-        
-        # 加载翻译键
-        keys_file = translations_dir / "_keys.yaml"
-        if keys_file.exists():
-            with open(keys_file, 'r', encoding='utf-8') as f:
-                keys_data = yaml.safe_load(f)
-                language_keys = {}
+        # 翻译文件未改动时直接使用上次解析结果
+        cache_file = _translations_cache_file(translations_dir)
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            cached = None
+        except Exception:
+            # 截断或由其他版本写入的缓存可能抛出任意异常，按无缓存处理
+            cached = False
+        if (isinstance(cached, tuple) and len(cached) == 3
+                and isinstance(cached[0], dict) and cached[0]
+                and isinstance(cached[1], dict) and isinstance(cached[2], dict)):
+            return cached
+        if cached is not None:
+            # 缓存内容无效，删除后重新解析YAML
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+        
+        # 加载翻译键（文件缺失时为空，直接打开而不先检查是否存在）
+        language_keys = {}
+        try:
+            with open(translations_dir / "_keys.yaml", 'rb') as f:
+                keys_data = _yaml_load(f)
                 for key in keys_data.get('language_keys', []):
                     language_keys[key] = key
-        else:
-            language_keys = {}
+        except FileNotFoundError:
+            pass
         
         # 加载语言显示名称
-        display_names_file = translations_dir / "_display_names.yaml"
-        if display_names_file.exists():
-            with open(display_names_file, 'r', encoding='utf-8') as f:
-                display_names_data = yaml.safe_load(f)
+        language_display_names = {}
+        try:
+            with open(translations_dir / "_display_names.yaml", 'rb') as f:
+                display_names_data = _yaml_load(f)
                 language_display_names = display_names_data.get('language_display_names', {})
-        else:
-            language_display_names = {}
+        except FileNotFoundError:
+            pass
         
         # 加载所有语言文件
         I18N = {}
-        for lang_file in translations_dir.glob("*.yaml"):
-            # 跳过配置文件
-            if lang_file.name.startswith('_'):
-                continue
-            
-            lang_code = lang_file.stem  # 文件名就是语言代码
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                translations = yaml.safe_load(f)
-                I18N[lang_code] = translations
+        with os.scandir(translations_dir) as it:
+            for entry in it:
+                # 跳过配置文件
+                if entry.name.startswith('_') or not entry.name.endswith('.yaml'):
+                    continue
+                
+                lang_code = entry.name[:-5]  # 文件名就是语言代码
+                # 以二进制打开，由libyaml直接解码UTF-8
+                with open(entry.path, 'rb') as f:
+                    I18N[lang_code] = _yaml_load(f)
         
         if I18N:
-            return I18N, language_keys, language_display_names
+            result = (I18N, language_keys, language_display_names)
+            _write_translations_cache(cache_file, result)
+            return result
             
     except Exception as e:
         print(f"警告: 加载翻译文件失败 ({e}), 使用默认英语翻译")
@@ -85,57 +194,145 @@ def load_translations():
     # 如果加载失败，返回基本的英语翻译
     return {"en_US": {}}, {}, {}
 
-# 加载翻译
-I18N, LANGUAGE_KEYS, LANGUAGE_DISPLAY_NAMES = load_translations()
+# 翻译表在第一次创建主窗口时才加载，只使用BuildWindow时不解析翻译文件
+I18N = {}
+LANGUAGE_KEYS = {}
+LANGUAGE_DISPLAY_NAMES = {}
+
+
+def ensure_translations():
+    """首次调用时加载翻译，之后直接返回"""
+    if I18N:
+        return
+    i18n, language_keys, language_display_names = load_translations()
+    # 驻留翻译键：代码中的键字面量已被驻留，查表时可直接按对象身份命中
+    for lang_code, table in i18n.items():
+        I18N[lang_code] = {sys.intern(key) if isinstance(key, str) else key: value
+                           for key, value in (table or {}).items()}
+    LANGUAGE_KEYS.update(language_keys)
+    LANGUAGE_DISPLAY_NAMES.update(language_display_names)
+
+
+def enlarge_pipe(fd: int):
+    """扩大输出管道容量，子进程快速输出时减少读写次数和双方的相互等待"""
+    try:
+        import fcntl
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", F_SETPIPE_SZ), PIPE_SIZE)
+    except (ImportError, OSError):
+        # 非Linux或超出 /proc/sys/fs/pipe-max-size 时保持默认容量
+        pass
+
+
+def setup_stdio():
+    """输出重定向到管道或文件时也按行刷新，由本程序启动的Python构建脚本同样不缓冲输出"""
+    for stream in (sys.stdout, sys.stderr):
+        if stream is not None:
+            stream.reconfigure(line_buffering=True)
+    # 写入进程环境，make及其调用的脚本都会继承
+    os.environ.setdefault("PYTHONUNBUFFERED", "1")
+
+
+# 配置页容器的样式，整个程序只安装一次
+PAGE_CSS = b".page-body { margin: 10px; }"
+_page_css_provider = None
+
+
+def install_page_css(screen):
+    """为配置页安装 page-body 样式（重复调用无副作用）"""
+    global _page_css_provider
+    if _page_css_provider is not None:
+        return
+    _page_css_provider = Gtk.CssProvider()
+    _page_css_provider.load_from_data(PAGE_CSS)
+    Gtk.StyleContext.add_provider_for_screen(
+        screen, _page_css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
 
 class HICBuildGUI(Gtk.ApplicationWindow):
     """HIC构建系统GTK GUI主窗口"""
     
+    # 构建输出写入间隔（毫秒）
+    OUTPUT_FLUSH_MS = 50
+    
+    # 配置预设
+    PRESETS = ("balanced", "release", "debug", "minimal", "performance")
+    
+    # 菜单项翻译键，对应UI文件中的 menu_<键> 对象
+    _MENU_KEYS = (
+        "file", "new_profile", "open_profile", "save_profile", "export_config",
+        "import_config", "preferences", "exit",
+        "view", "dark_theme", "light_theme",
+        "build", "start_build", "stop_build", "clean", "install",
+        "help", "documentation", "about",
+    )
+    # 工具栏用到的翻译键，创建时一次取出
+    _TOOLBAR_KEYS = ("start_build", "stop_build", "clean", "install", "preset")
+    
     def __init__(self, app):
         super().__init__(application=app)
         self.current_language = "zh_CN"
         self.current_theme = "dark"
         self.current_preset = "balanced"
         self.is_building = False
-        self.build_thread = None
+        self._build_future = None
+        self._build_proc = None
+        # 当前构建的停止请求，每次构建新建一个
+        self._build_stop = threading.Event()
+        
+        # 构建、清理、安装等子进程工作统一交给后台线程执行，不阻塞主循环；
+        # 只有一个工作线程，这些操作作用于同一个源码树，必须依次执行
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hic-build")
+        self.connect("destroy", self.on_destroy)
+        
+        # 构建线程产生的输出先放入队列，由主线程定时批量写入
+        self._pending_output = []
+        self._pending_output_lock = threading.Lock()
+        self._output_source_id = None
         
         # 保存UI元素引用
         self.ui_elements = {}
         
+        # 加载翻译
+        ensure_translations()
+        
+        # 语言下拉框的语言列表（各语言共用简体中文表中的名称），以及 语言代码 -> 序号
+        self._lang_map = I18N.get("zh_CN", {}).get("languages", {})
+        self._lang_order = tuple(self._lang_map)
+        self._lang_index = {code: i for i, code in enumerate(self._lang_order)}
+        
         # 加载配置
         self.load_config()
         
+        # 当前语言的翻译表，切换语言时更新
+        self._t = I18N.get(self.current_language, {})
+        
         # 初始化UI
+        install_page_css(self.get_screen())
         self.init_ui()
         self.apply_theme()
         self.retranslate_ui()
     
     def _(self, key: str) -> str:
         """翻译函数"""
-        if self.current_language in I18N:
-            return I18N[self.current_language].get(key, key)
-        return key
+        return self._t.get(key, key)
 
     def update_language_label(self):
         """更新语言标签，显示当前选择的语言名称"""
-        languages = I18N["zh_CN"]["languages"]
-        if self.current_language in languages:
-            current_language_name = languages[self.current_language]
+        current_language_name = self._lang_map.get(self.current_language)
+        if current_language_name is not None:
             self.language_label.set_text(current_language_name + "：")
 
     def load_config(self):
         """从YAML加载配置"""
         try:
-            import yaml
             if PLATFORM_YAML.exists():
-                with open(PLATFORM_YAML, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if 'build_system' in data:
-                        bs = data['build_system']
-                        if 'localization' in bs:
-                            self.current_language = bs['localization'].get('language', 'zh_CN')
-                        if 'presets' in bs:
-                            self.current_preset = bs['presets'].get('default', 'balanced')
+                # 只解析build_system一节，不解析整个平台配置
+                bs = _load_yaml_section(PLATFORM_YAML, 'build_system')
+                if bs:
+                    if 'localization' in bs:
+                        self.current_language = bs['localization'].get('language', 'zh_CN')
+                    if 'presets' in bs:
+                        self.current_preset = bs['presets'].get('default', 'balanced')
         except:
             pass
     
@@ -167,119 +364,47 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.show_all()
     
     def create_menu_bar(self):
-        """创建菜单栏"""
-        self.menu_bar = Gtk.MenuBar()
-        
-        # 文件菜单
-        file_menu = Gtk.MenuItem.new_with_label(self._("file"))
-        file_submenu = Gtk.Menu()
-        
-        new_profile_item = Gtk.MenuItem.new_with_label(self._("new_profile"))
-        new_profile_item.connect("activate", self.new_profile)
-        file_submenu.append(new_profile_item)
-        
-        open_profile_item = Gtk.MenuItem.new_with_label(self._("open_profile"))
-        open_profile_item.connect("activate", self.open_profile)
-        file_submenu.append(open_profile_item)
-        
-        save_profile_item = Gtk.MenuItem.new_with_label(self._("save_profile"))
-        save_profile_item.connect("activate", self.save_profile)
-        file_submenu.append(save_profile_item)
+        """创建菜单栏
         
-        file_submenu.append(Gtk.SeparatorMenuItem())
+        菜单结构和信号定义在UI文件中，由GtkBuilder一次创建，这里只设置文字
+        """
+        builder = Gtk.Builder()
+        builder.add_objects_from_file(str(UI_FILE), ["menu_bar"])
+        builder.connect_signals(self)
+        self.menu_bar = builder.get_object("menu_bar")
         
-        export_config_item = Gtk.MenuItem.new_with_label(self._("export_config"))
-        export_config_item.connect("activate", self.export_config)
-        file_submenu.append(export_config_item)
-        
-        import_config_item = Gtk.MenuItem.new_with_label(self._("import_config"))
-        import_config_item.connect("activate", self.import_config)
-        file_submenu.append(import_config_item)
-        
-        file_submenu.append(Gtk.SeparatorMenuItem())
-        
-        preferences_item = Gtk.MenuItem.new_with_label(self._("preferences"))
-        preferences_item.connect("activate", self.preferences)
-        file_submenu.append(preferences_item)
-        
-        file_submenu.append(Gtk.SeparatorMenuItem())
-        
-        exit_item = Gtk.MenuItem.new_with_label(self._("exit"))
-        exit_item.connect("activate", self.close)
-        file_submenu.append(exit_item)
-        
-        file_menu.set_submenu(file_submenu)
-        self.menu_bar.append(file_menu)
-        
-        # 视图菜单
-        view_menu = Gtk.MenuItem.new_with_label(self._("view"))
-        view_submenu = Gtk.Menu()
-        
-        dark_theme_item = Gtk.MenuItem.new_with_label(self._("dark_theme"))
-        dark_theme_item.connect("activate", lambda x: self.set_theme("dark"))
-        view_submenu.append(dark_theme_item)
-        
-        light_theme_item = Gtk.MenuItem.new_with_label(self._("light_theme"))
-        light_theme_item.connect("activate", lambda x: self.set_theme("light"))
-        view_submenu.append(light_theme_item)
-        
-        view_menu.set_submenu(view_submenu)
-        self.menu_bar.append(view_menu)
-        
-        # 构建菜单
-        build_menu = Gtk.MenuItem.new_with_label(self._("build"))
-        build_submenu = Gtk.Menu()
-        
-        start_build_item = Gtk.MenuItem.new_with_label(self._("start_build"))
-        start_build_item.connect("activate", self.start_build)
-        build_submenu.append(start_build_item)
-        
-        stop_build_item = Gtk.MenuItem.new_with_label(self._("stop_build"))
-        stop_build_item.connect("activate", self.stop_build)
-        build_submenu.append(stop_build_item)
-        
-        build_submenu.append(Gtk.SeparatorMenuItem())
-        
-        clean_item = Gtk.MenuItem.new_with_label(self._("clean"))
-        clean_item.connect("activate", self.clean)
-        build_submenu.append(clean_item)
-        
-        install_item = Gtk.MenuItem.new_with_label(self._("install"))
-        install_item.connect("activate", self.install)
-        build_submenu.append(install_item)
-        
-        build_menu.set_submenu(build_submenu)
-        self.menu_bar.append(build_menu)
-        
-        # 帮助菜单
-        help_menu = Gtk.MenuItem.new_with_label(self._("help"))
-        help_submenu = Gtk.Menu()
-        
-        documentation_item = Gtk.MenuItem.new_with_label(self._("documentation"))
-        documentation_item.connect("activate", self.show_documentation)
-        help_submenu.append(documentation_item)
-        
-        about_item = Gtk.MenuItem.new_with_label(self._("about"))
-        about_item.connect("activate", self.show_about)
-        help_submenu.append(about_item)
-        
-        help_menu.set_submenu(help_submenu)
-        self.menu_bar.append(help_menu)
+        # 翻译键 -> 菜单项，切换语言时重新设置文字
+        self.menu_items = {key: builder.get_object(f"menu_{key}") for key in self._MENU_KEYS}
+        for key, item in self.menu_items.items():
+            item.set_label(self._t.get(key, key))
+    
+    def on_exit_activate(self, widget):
+        """菜单: 退出"""
+        self.close()
+    
+    def on_dark_theme_activate(self, widget):
+        """菜单: 深色主题"""
+        self.set_theme("dark")
+    
+    def on_light_theme_activate(self, widget):
+        """菜单: 浅色主题"""
+        self.set_theme("light")
     
     def create_tool_bar(self):
         """创建工具栏"""
+        t = {key: self._t.get(key, key) for key in self._TOOLBAR_KEYS + self.PRESETS}
         self.toolbar = Gtk.Toolbar()
         self.toolbar.set_style(Gtk.ToolbarStyle.BOTH_HORIZ)
         
         # 构建按钮
-        self.start_build_btn = Gtk.ToolButton.new_from_stock(Gtk.STOCK_EXECUTE)
-        self.start_build_btn.set_label(self._("start_build"))
+        self.start_build_btn = Gtk.ToolButton.new(
+            Gtk.Image.new_from_icon_name("system-run", Gtk.IconSize.LARGE_TOOLBAR), t["start_build"])
         self.start_build_btn.connect("clicked", self.start_build)
         self.toolbar.insert(self.start_build_btn, 0)
         
         # 停止按钮
-        self.stop_build_btn = Gtk.ToolButton.new_from_stock(Gtk.STOCK_STOP)
-        self.stop_build_btn.set_label(self._("stop_build"))
+        self.stop_build_btn = Gtk.ToolButton.new(
+            Gtk.Image.new_from_icon_name("process-stop", Gtk.IconSize.LARGE_TOOLBAR), t["stop_build"])
         self.stop_build_btn.connect("clicked", self.stop_build)
         self.stop_build_btn.set_sensitive(False)
         self.toolbar.insert(self.stop_build_btn, 1)
@@ -287,32 +412,31 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.toolbar.insert(Gtk.SeparatorToolItem(), 2)
         
         # 清理按钮
-        clean_btn = Gtk.ToolButton.new_from_stock(Gtk.STOCK_CLEAR)
-        clean_btn.set_label(self._("clean"))
-        clean_btn.connect("clicked", self.clean)
-        self.toolbar.insert(clean_btn, 3)
+        self.clean_btn = Gtk.ToolButton.new(
+            Gtk.Image.new_from_icon_name("edit-clear", Gtk.IconSize.LARGE_TOOLBAR), t["clean"])
+        self.clean_btn.connect("clicked", self.clean)
+        self.toolbar.insert(self.clean_btn, 3)
         
         # 安装按钮
-        install_btn = Gtk.ToolButton.new_from_stock(Gtk.STOCK_APPLY)
-        install_btn.set_label(self._("install"))
-        install_btn.connect("clicked", self.install)
-        self.toolbar.insert(install_btn, 4)
+        self.install_btn = Gtk.ToolButton.new(
+            Gtk.Image.new_from_icon_name("emblem-ok", Gtk.IconSize.LARGE_TOOLBAR), t["install"])
+        self.install_btn.connect("clicked", self.install)
+        self.toolbar.insert(self.install_btn, 4)
         
         self.toolbar.insert(Gtk.SeparatorToolItem(), 5)
         
         # 预设标签
         preset_label = Gtk.Label()
-        preset_label.set_text(self._("preset") + "：")
+        preset_label.set_text(t["preset"] + "：")
         preset_item = Gtk.ToolItem()
         preset_item.add(preset_label)
         self.toolbar.insert(preset_item, 6)
         
         # 预设下拉框
         self.preset_combo = Gtk.ComboBoxText()
-        presets = ["balanced", "release", "debug", "minimal", "performance"]
-        for preset in presets:
-            self.preset_combo.append_text(self._(preset))
-        self.preset_combo.set_active(presets.index(self.current_preset))
+        for preset in self.PRESETS:
+            self.preset_combo.append_text(t[preset])
+        self.preset_combo.set_active(self.PRESETS.index(self.current_preset))
         self.preset_combo.connect("changed", self.on_preset_changed)
         preset_item = Gtk.ToolItem()
         preset_item.add(self.preset_combo)
@@ -329,11 +453,10 @@ class HICBuildGUI(Gtk.ApplicationWindow):
 
         # 语言下拉框
         self.language_combo = Gtk.ComboBoxText()
-        languages = I18N["zh_CN"]["languages"]
         # 格式: "简体中文" 或 "English"
-        for code, name in languages.items():
+        for name in self._lang_map.values():
             self.language_combo.append_text(name)
-        self.language_combo.set_active(list(languages.keys()).index(self.current_language))
+        self.language_combo.set_active(self._lang_index.get(self.current_language, -1))
         self.language_combo.connect("changed", self.on_language_changed)
         language_item = Gtk.ToolItem()
         language_item.add(self.language_combo)
@@ -370,6 +493,10 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.output_text.set_editable(False)
         self.output_text.set_monospace(True)
         output_scrolled.add(self.output_text)
+        # 缓存缓冲区和末尾标记（右重力，插入后始终停在末尾），追加时不再反复查询
+        self._output_buffer = self.output_text.get_buffer()
+        self._output_end_mark = self._output_buffer.create_mark(
+            None, self._output_buffer.get_end_iter(), False)
         self.output_notebook.append_page(output_scrolled, Gtk.Label.new(self._("output")))
         
         # 构建日志
@@ -379,6 +506,9 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.log_text.set_editable(False)
         self.log_text.set_monospace(True)
         log_scrolled.add(self.log_text)
+        self._log_buffer = self.log_text.get_buffer()
+        self._log_end_mark = self._log_buffer.create_mark(
+            None, self._log_buffer.get_end_iter(), False)
         self.output_notebook.append_page(log_scrolled, Gtk.Label.new(self._("log")))
         
         right_box.pack_start(self.output_notebook, True, True, 0)
@@ -389,54 +519,75 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.central_paned.set_position(500)
     
     def create_config_tabs(self):
-        """创建配置选项卡"""
+        """创建配置选项卡
+        
+        启动时只创建空白页和标签，页面内容在第一次切换到该页时才创建
+        """
         # 创建配置选项卡容器
         self.notebook = Gtk.Notebook()
-
-        # 构建配置页
-        self.create_build_config_tab()
-
-        # 运行时配置页
-        self.create_runtime_config_tab()
-
-        # 系统限制页
-        self.create_system_limits_tab()
-
-        # 功能特性页
-        self.create_features_tab()
-
-        # CPU特性页
-        self.create_cpu_features_tab()
-
-        # 调度器页
-        self.create_scheduler_tab()
-        
-        # 安全配置页
-        self.create_security_tab()
         
-        # 内存配置页
-        self.create_memory_tab()
+        # 标签页翻译键 -> 页面内容创建函数
+        tabs = [
+            ("build_config", self.create_build_config_tab),        # 构建配置页
+            ("runtime_config", self.create_runtime_config_tab),    # 运行时配置页
+            ("system_limits", self.create_system_limits_tab),      # 系统限制页
+            ("features", self.create_features_tab),                # 功能特性页
+            ("cpu_features", self.create_cpu_features_tab),        # CPU特性页
+            ("scheduler", self.create_scheduler_tab),              # 调度器页
+            ("security", self.create_security_tab),                # 安全配置页
+            ("memory", self.create_memory_tab),                    # 内存配置页
+            ("debug_tab", self.create_debug_tab),                  # 调试选项页
+            ("drivers", self.create_drivers_tab),                  # 驱动配置页
+            ("performance_tab", self.create_performance_tab),      # 性能配置页
+        ]
         
-        # 调试选项页
-        self.create_debug_tab()
+        # 尚未创建内容的页: 页号 -> 创建函数
+        self._pending_tabs = {}
+        for key, create_tab in tabs:
+            page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            page_num = self.notebook.append_page(page, Gtk.Label.new(self._(key)))
+            self._pending_tabs[page_num] = create_tab
         
-        # 驱动配置页
-        self.create_drivers_tab()
+        self.notebook.connect("switch-page", self.on_config_tab_switched)
         
-        # 性能配置页
-        self.create_performance_tab()
+        # 当前显示的第一页立即创建
+        current = self.notebook.get_current_page()
+        self.on_config_tab_switched(self.notebook, self.notebook.get_nth_page(current), current)
+    
+    def on_config_tab_switched(self, notebook, page, page_num):
+        """切换到尚未创建内容的配置页时创建其内容"""
+        create_tab = self._pending_tabs.pop(page_num, None)
+        if create_tab is None:
+            return
+        box = create_tab()
+        page.pack_start(box, True, True, 0)
+        box.show_all()
+    
+    def create_tab_box(self, row_spacing=10):
+        """创建配置页容器和其中的网格，返回 (box, grid)"""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        box.get_style_context().add_class("page-body")
+        grid = Gtk.Grid(column_spacing=10, row_spacing=row_spacing)
+        box.pack_start(grid, False, False, 0)
+        return box, grid
+    
+    def create_check_column(self, grid, features, translate=True):
+        """在grid第一列创建一组复选框
+        
+        features为 (键, 默认选中) 序列，返回 键 -> 复选框
+        """
+        checks = {}
+        for row, (feature, default) in enumerate(features):
+            check = Gtk.CheckButton.new_with_label(self._(feature) if translate else feature)
+            if default:
+                check.set_active(True)
+            grid.attach(check, 0, row, 1, 1)
+            checks[feature] = check
+        return checks
     
     def create_build_config_tab(self):
         """创建构建配置选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(10)
+        box, grid = self.create_tab_box()
         
         # 优化级别
         row = 0
@@ -456,35 +607,23 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.lto_check = Gtk.CheckButton.new_with_label(self._("lto"))
         grid.attach(self.lto_check, 0, row, 2, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("build_config")))
+        return box
     
     def create_runtime_config_tab(self):
         """创建运行时配置选项卡"""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
+        box.get_style_context().add_class("page-body")
         
         label = Gtk.Label()
         label.set_markup("<i>运行时配置通过platform.yaml传递给内核</i>")
         label.set_halign(Gtk.Align.START)
         box.pack_start(label, False, False, 0)
         
-        self.notebook.append_page(box, Gtk.Label.new(self._("runtime_config")))
+        return box
     
     def create_system_limits_tab(self):
         """创建系统限制选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(10)
+        box, grid = self.create_tab_box()
         
         # 最大域数
         row = 0
@@ -510,66 +649,32 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.max_threads_spin.set_value(256)
         grid.attach(self.max_threads_spin, 1, row, 1, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("system_limits")))
+        return box
     
     def create_features_tab(self):
         """创建功能特性选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(5)
+        box, grid = self.create_tab_box(5)
         
         # 功能列表
-        self.feature_checks = {}
         features = ["smp", "acpi", "pci", "usb", "virtio", "efi"]
+        self.feature_checks = self.create_check_column(
+            grid, [(feature, False) for feature in features])
         
-        for i, feature in enumerate(features):
-            self.feature_checks[feature] = Gtk.CheckButton.new_with_label(self._(feature))
-            grid.attach(self.feature_checks[feature], 0, i, 1, 1)
-        
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("features")))
+        return box
     
     def create_cpu_features_tab(self):
         """创建CPU特性选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(5)
+        box, grid = self.create_tab_box(5)
         
-        self.cpu_feature_checks = {}
         cpu_features = ["MMX", "SSE", "SSE2", "SSE3", "SSSE3", "SSE4.1", "SSE4.2", "AVX", "AVX2", "AES-NI", "RDRAND"]
+        self.cpu_feature_checks = self.create_check_column(
+            grid, [(feature, True) for feature in cpu_features], translate=False)
         
-        for i, feature in enumerate(cpu_features):
-            self.cpu_feature_checks[feature] = Gtk.CheckButton.new_with_label(feature)
-            self.cpu_feature_checks[feature].set_active(True)
-            grid.attach(self.cpu_feature_checks[feature], 0, i, 1, 1)
-        
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("cpu_features")))
+        return box
     
     def create_scheduler_tab(self):
         """创建调度器选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(10)
+        box, grid = self.create_tab_box()
         
         # 调度策略
         row = 0
@@ -609,22 +714,12 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.load_balance_threshold_spin.set_value(80)
         grid.attach(self.load_balance_threshold_spin, 1, row, 1, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("scheduler")))
+        return box
     
     def create_security_tab(self):
         """创建安全配置选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(5)
+        box, grid = self.create_tab_box(5)
         
-        self.security_checks = {}
         security_features = [
             ("KASLR", False),
             ("SMEP", False),
@@ -636,10 +731,7 @@ class HICBuildGUI(Gtk.ApplicationWindow):
             ("zero_on_free", True)
         ]
         
-        for i, (feature, default) in enumerate(security_features):
-            self.security_checks[feature] = Gtk.CheckButton.new_with_label(self._(feature))
-            self.security_checks[feature].set_active(default)
-            grid.attach(self.security_checks[feature], 0, i, 1, 1)
+        self.security_checks = self.create_check_column(grid, security_features)
         
         # 隔离模式
         row = len(security_features)
@@ -650,20 +742,11 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.isolation_mode_combo.set_active(0)
         grid.attach(self.isolation_mode_combo, 1, row, 1, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("security")))
+        return box
     
     def create_memory_tab(self):
         """创建内存配置选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(10)
+        box, grid = self.create_tab_box()
         
         # 堆大小
         row = 0
@@ -705,22 +788,12 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.max_page_tables_spin.set_value(256)
         grid.attach(self.max_page_tables_spin, 1, row, 1, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("memory")))
+        return box
     
     def create_debug_tab(self):
         """创建调试选项选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
+        box, grid = self.create_tab_box(5)
         
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(5)
-        
-        self.debug_checks = {}
         debug_features = [
             ("console_log", True),
             ("serial_log", True),
@@ -731,34 +804,18 @@ class HICBuildGUI(Gtk.ApplicationWindow):
             ("trace", False)
         ]
         
-        for i, (feature, default) in enumerate(debug_features):
-            self.debug_checks[feature] = Gtk.CheckButton.new_with_label(feature)
-            self.debug_checks[feature].set_active(default)
-            grid.attach(self.debug_checks[feature], 0, i, 1, 1)
+        self.debug_checks = self.create_check_column(grid, debug_features, translate=False)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("debug_tab")))
+        return box
     
     def create_drivers_tab(self):
         """创建驱动配置选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(10)
+        box, grid = self.create_tab_box()
         
         # 驱动列表
-        self.driver_checks = {}
         drivers = ["console_driver", "keyboard_driver", "ps2_mouse", "uart_driver"]
-        
-        for i, driver in enumerate(drivers):
-            self.driver_checks[driver] = Gtk.CheckButton.new_with_label(driver)
-            self.driver_checks[driver].set_active(True)
-            grid.attach(self.driver_checks[driver], 0, i, 1, 1)
+        self.driver_checks = self.create_check_column(
+            grid, [(driver, True) for driver in drivers], translate=False)
         
         # 波特率
         row = len(drivers)
@@ -778,22 +835,12 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.data_bits_combo.set_active(3)
         grid.attach(self.data_bits_combo, 1, row, 1, 1)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("drivers")))
+        return box
     
     def create_performance_tab(self):
         """创建性能配置选项卡"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
+        box, grid = self.create_tab_box(5)
         
-        grid = Gtk.Grid()
-        grid.set_column_spacing(10)
-        grid.set_row_spacing(5)
-        
-        self.performance_checks = {}
         performance_features = [
             ("fast_path", True),
             ("perf_counter", False),
@@ -803,13 +850,10 @@ class HICBuildGUI(Gtk.ApplicationWindow):
             ("throughput_opt", False)
         ]
         
-        for i, (feature, default) in enumerate(performance_features):
-            self.performance_checks[feature] = Gtk.CheckButton.new_with_label(feature)
-            self.performance_checks[feature].set_active(default)
-            grid.attach(self.performance_checks[feature], 0, i, 1, 1)
+        self.performance_checks = self.create_check_column(
+            grid, performance_features, translate=False)
         
-        box.pack_start(grid, False, False, 0)
-        self.notebook.append_page(box, Gtk.Label.new(self._("performance_tab")))
+        return box
     
     def create_status_bar(self):
         """创建状态栏"""
@@ -818,6 +862,8 @@ class HICBuildGUI(Gtk.ApplicationWindow):
     
     def set_theme(self, theme: str):
         """设置主题"""
+        if theme == self.current_theme:
+            return
         self.current_theme = theme
         self.apply_theme()
     
@@ -825,28 +871,23 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         """应用主题"""
         settings = Gtk.Settings.get_default()
         
-        if self.current_theme == "dark":
-            settings.set_property("gtk-application-prefer-dark-theme", True)
-        else:
-            settings.set_property("gtk-application-prefer-dark-theme", False)
+        # 每次设置都会让GTK重新解析样式并刷新所有控件，值未变化时跳过
+        dark = self.current_theme == "dark"
+        if settings.get_property("gtk-application-prefer-dark-theme") != dark:
+            settings.set_property("gtk-application-prefer-dark-theme", dark)
     
     def on_language_changed(self, combo):
         """语言改变事件"""
         index = combo.get_active()
-        languages = I18N["zh_CN"]["languages"]
-        self.current_language = list(languages.keys())[index]
-
-        # 更新语言标签
-        self.update_language_label()
-
-        # 重新翻译语言下拉框的选项
-        GObject.signal_handlers_block_by_func(combo, self.on_language_changed)
-        combo.remove_all()
-        for code, name in languages.items():
-            combo.append_text(name)
-        combo.set_active(index)
-        GObject.signal_handlers_unblock_by_func(combo, self.on_language_changed)
+        if index < 0:
+            return
+        lang_code = self._lang_order[index]
+        if lang_code == self.current_language:
+            return
+        self.current_language = lang_code
+        self._t = I18N.get(lang_code, {})
 
+        # 语言标签由retranslate_ui一并更新
         self.retranslate_ui()
     
     def on_preset_changed(self, combo):
@@ -856,15 +897,7 @@ class HICBuildGUI(Gtk.ApplicationWindow):
     
     def apply_preset(self):
         """应用预设配置"""
-        preset_map = {
-            self._("balanced"): "balanced",
-            self._("release"): "release",
-            self._("debug"): "debug",
-            self._("minimal"): "minimal",
-            self._("performance"): "performance"
-        }
-        
-        preset_code = preset_map.get(self.current_preset, "balanced")
+        preset_code = self._preset_map.get(self.current_preset, "balanced")
         # 这里应该根据预设更新配置
         # 暂时只打印消息
         self.log(f"应用预设: {preset_code}")
@@ -874,8 +907,9 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         self.set_title(self._("title"))
         
         # 重新翻译菜单
-        # GTK的菜单需要重新创建或更新
-        # 这里简化处理，只更新状态栏
+        for key, item in self.menu_items.items():
+            item.set_label(self._(key))
+        
         self.update_status(self._("ready"))
         
         # 重新翻译预设下拉框
@@ -884,38 +918,26 @@ class HICBuildGUI(Gtk.ApplicationWindow):
         # 阻止信号触发以避免递归
         GObject.signal_handlers_block_by_func(self.preset_combo, self.on_preset_changed)
         self.preset_combo.remove_all()
-        presets = ["balanced", "release", "debug", "minimal", "performance"]
-        for preset in presets:
+        # 译名 -> 预设代码，切换语言时重建，apply_preset直接查表
+        self._preset_map = {self._(preset): preset for preset in self.PRESETS}
+        for preset in self.PRESETS:
             self.preset_combo.append_text(self._(preset))
         self.preset_combo.set_active(active)
         GObject.signal_handlers_unblock_by_func(self.preset_combo, self.on_preset_changed)
         
-        # 重新翻译语言下拉框
+        # 语言下拉框的名称不随界面语言变化，只需按语言代码同步选中项
         self.update_language_label()
-        current_lang_code = self.current_language  # 保存当前语言代码
-        active_lang = self.language_combo.get_active()
-
-        # 阻止信号触发以避免递归
-        GObject.signal_handlers_block_by_func(combo, self.on_language_changed)
-        combo.remove_all()
-        languages = I18N.get("zh_CN", {}).get("languages", {})
-        lang_code_list = list(languages.keys())
-        for code in lang_code_list:
-            name = languages[code]
-            display_text = f"{name} ({name})"
-            combo.append_text(display_text)
-
-        # 根据语言代码恢复选择
-        if current_lang_code in lang_code_list:
-            combo.set_active(lang_code_list.index(current_lang_code))
-        elif active_lang < len(lang_code_list):
-            combo.set_active(active_lang)
-
-        GObject.signal_handlers_unblock_by_func(combo, self.on_language_changed)
+        index = self._lang_index.get(self.current_language)
+        if index is not None and index != self.language_combo.get_active():
+            # 阻止信号触发以避免递归
+            GObject.signal_handlers_block_by_func(self.language_combo, self.on_language_changed)
+            self.language_combo.set_active(index)
+            GObject.signal_handlers_unblock_by_func(self.language_combo, self.on_language_changed)
         
         # 确保current_language有效
         if self.current_language not in I18N:
             self.current_language = "zh_CN"  # 默认语言
+            self._t = I18N.get(self.current_language, {})
         
         # 重新翻译标签页
         tab_names = [self._("build_config"), self._("runtime_config"), 
@@ -943,55 +965,97 @@ class HICBuildGUI(Gtk.ApplicationWindow):
     
     def log(self, message: str, level: str = "info"):
         """添加日志"""
-        buffer = self.log_text.get_buffer()
-        end_iter = buffer.get_end_iter()
-        buffer.insert(end_iter, f"[{level.upper()}] {message}\n")
+        buffer = self._log_buffer
+        buffer.insert(buffer.get_iter_at_mark(self._log_end_mark), f"[{level.upper()}] {message}\n")
+        self._trim_buffer(buffer)
     
     def append_output(self, text: str):
         """添加输出"""
-        buffer = self.output_text.get_buffer()
-        end_iter = buffer.get_end_iter()
-        buffer.insert(end_iter, text)
-    
-    def start_build(self):
+        buffer = self._output_buffer
+        buffer.insert(buffer.get_iter_at_mark(self._output_end_mark), text)
+        self._trim_buffer(buffer)
+    
+    @staticmethod
+    def _trim_buffer(buffer):
+        """超出 LOG_MAX_LINES 行时从缓冲区头部删除旧行"""
+        excess = buffer.get_line_count() - LOG_MAX_LINES
+        if excess > 0:
+            buffer.delete(buffer.get_start_iter(), buffer.get_iter_at_line(excess))
+    
+    def queue_output(self, text: str):
+        """从构建线程添加输出，每 OUTPUT_FLUSH_MS 毫秒合并写入一次"""
+        with self._pending_output_lock:
+            self._pending_output.append(text)
+            if self._output_source_id is None:
+                self._output_source_id = GLib.timeout_add(self.OUTPUT_FLUSH_MS, self._flush_output)
+    
+    def _flush_output(self):
+        """把积累的输出一次性写入输出视图"""
+        with self._pending_output_lock:
+            batch = self._pending_output
+            self._pending_output = []
+            self._output_source_id = None
+        self.append_output("".join(batch))
+        return False
+    
+    def start_build(self, widget=None):
         """开始构建"""
         if self.is_building:
             return
         
-        self.is_building = True
-        self.start_build_btn.set_sensitive(False)
-        self.stop_build_btn.set_sensitive(True)
+        self.set_busy(True, stoppable=True)
         self.update_status(self._("building"))
         
-        # 清空输出
-        output_buffer = self.output_text.get_buffer()
-        output_buffer.set_text("")
-        
-        log_buffer = self.log_text.get_buffer()
-        log_buffer.set_text("")
+        # 清空输出，包括上一次构建尚未写入的部分
+        with self._pending_output_lock:
+            self._pending_output.clear()
+        self._output_buffer.set_text("")
+        self._log_buffer.set_text("")
         
         self.log("开始构建...")
         
-        # 在新线程中运行构建
-        self.build_thread = threading.Thread(target=self.run_build_thread)
-        self.build_thread.start()
+        # 在后台线程池中运行构建
+        self._build_stop = threading.Event()
+        self._build_future = self._executor.submit(self.run_build_thread, self._build_stop)
     
-    def run_build_thread(self):
-        """运行构建线程"""
+    def run_build_thread(self, stop_event: threading.Event):
+        """运行构建线程，stop_event被设置后不再报告构建结果"""
+        if stop_event.is_set():
+            return
         try:
             process = subprocess.Popen(
-                ["make", "all"],
+                [*LINE_BUFFERED, "make", "all"],
                 cwd=str(ROOT_DIR),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
+                bufsize=PIPE_READ_SIZE,
+                # 独立进程组，停止构建时连同make派生的编译器一起终止
+                start_new_session=True
             )
+            self._build_proc = process
+            # 在Popen返回前按下了停止：stop_build看不到进程，由这里终止
+            if stop_event.is_set():
+                self._signal_build(process, signal.SIGKILL)
+            enlarge_pipe(process.stdout.fileno())
             
-            for line in process.stdout:
-                GLib.idle_add(self.append_output, line)
+            # 按块读取管道而不是逐行读取，多字节字符可能跨块，用增量解码器拼接
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            # 停止后继续读空管道直到make退出，但不再转发输出，以免混入下一次构建
+            while chunk := process.stdout.read1(PIPE_READ_SIZE):
+                if not stop_event.is_set():
+                    self.queue_output(decoder.decode(chunk))
+            tail = decoder.decode(b"", final=True)
+            if tail and not stop_event.is_set():
+                self.queue_output(tail)
             
             return_code = process.wait()
+            process.stdout.close()
+            
+            if self._build_proc is process:
+                self._build_proc = None
+            # 已被stop_build终止，状态由stop_build更新
+            if stop_event.is_set():
+                return
             
             if return_code == 0:
                 GLib.idle_add(self.on_build_success)
@@ -999,63 +1063,103 @@ class HICBuildGUI(Gtk.ApplicationWindow):
                 GLib.idle_add(self.on_build_failed)
                 
         except Exception as e:
-            GLib.idle_add(self.on_build_error, str(e))
+            if not stop_event.is_set():
+                GLib.idle_add(self.on_build_error, str(e))
     
     def on_build_success(self):
         """构建成功"""
-        self.is_building = False
-        self.start_build_btn.set_sensitive(True)
-        self.stop_build_btn.set_sensitive(False)
+        self.set_busy(False)
         self.update_status(self._("build_success"))
         self.log("构建成功！", "success")
         self.progress_bar.set_fraction(1.0)
     
     def on_build_failed(self):
         """构建失败"""
-        self.is_building = False
-        self.start_build_btn.set_sensitive(True)
-        self.stop_build_btn.set_sensitive(False)
+        self.set_busy(False)
         self.update_status(self._("build_failed"))
         self.log("构建失败！", "error")
         self.progress_bar.set_fraction(0.0)
     
     def on_build_error(self, error: str):
         """构建错误"""
-        self.is_building = False
-        self.start_build_btn.set_sensitive(True)
-        self.stop_build_btn.set_sensitive(False)
+        self.set_busy(False)
         self.update_status(self._("build_failed"))
         self.log(f"构建错误: {error}", "error")
         self.progress_bar.set_fraction(0.0)
     
-    def stop_build(self):
+    def stop_build(self, widget=None):
         """停止构建"""
-        if self.build_thread and self.build_thread.is_alive():
-            self.is_building = False
+        if self._build_future and not self._build_future.done():
             self.log("正在停止构建...", "warning")
-            # 这里应该终止构建进程
-            # 暂时只设置状态
-            self.start_build_btn.set_sensitive(True)
-            self.stop_build_btn.set_sensitive(False)
+            self._build_stop.set()
+            # 仍在排队（前一个任务尚未结束）时直接取消，不会再启动
+            self._build_future.cancel()
+            process, self._build_proc = self._build_proc, None
+            if process is not None:
+                self._signal_build(process, signal.SIGTERM)
+                # 3秒后仍未退出则强制结束
+                GLib.timeout_add_seconds(3, self._kill_build, process)
+            self.set_busy(False)
             self.update_status(self._("build_stopped"))
     
-    def clean(self):
+    def on_destroy(self, widget):
+        """关闭窗口：终止仍在运行的构建进程组，再关闭线程池"""
+        self.stop_build()
+        self._executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _signal_build(process, sig):
+        """向构建进程所在的进程组发送信号"""
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+    
+    def _kill_build(self, process):
+        """终止超时后强制结束构建进程组"""
+        if process.poll() is None:
+            self._signal_build(process, signal.SIGKILL)
+        return False
+    
+    def set_busy(self, busy: bool, stoppable: bool = False):
+        """构建、清理、安装期间禁用其他操作，避免在同一源码树上同时运行make"""
+        self.is_building = busy
+        self.start_build_btn.set_sensitive(not busy)
+        self.clean_btn.set_sensitive(not busy)
+        self.install_btn.set_sensitive(not busy)
+        self.stop_build_btn.set_sensitive(busy and stoppable)
+    
+    def clean(self, widget=None):
         """清理构建"""
+        if self.is_building:
+            return
         self.log("清理构建文件...")
-        try:
-            subprocess.run(["make", "clean"], cwd=str(ROOT_DIR), check=True)
-            self.log("清理完成", "success")
-        except subprocess.CalledProcessError as e:
-            self.log(f"清理失败: {e}", "error")
+        self.run_make_async("clean", "清理")
     
-    def install(self):
+    def install(self, widget=None):
         """安装"""
+        if self.is_building:
+            return
         self.log("安装构建产物...")
+        self.run_make_async("install", "安装")
+    
+    def run_make_async(self, target: str, action: str):
+        """在后台线程池中执行 make target，完成后回到主线程记录结果"""
+        self.set_busy(True)
+        future = self._executor.submit(
+            subprocess.run, ["make", target], cwd=str(ROOT_DIR), check=True)
+        future.add_done_callback(lambda f: GLib.idle_add(self._on_make_done, f, action))
+    
+    def _on_make_done(self, future, action: str):
+        """make执行结束（主线程）"""
         try:
-            subprocess.run(["make", "install"], cwd=str(ROOT_DIR), check=True)
-            self.log("安装完成", "success")
-        except subprocess.CalledProcessError as e:
-            self.log(f"安装失败: {e}", "error")
+            future.result()
+        except (subprocess.CalledProcessError, OSError) as e:
+            self.log(f"{action}失败: {e}", "error")
+        else:
+            self.log(f"{action}完成", "success")
+        self.set_busy(False)
+        return False
     
     # 以下为占位函数
     def new_profile(self, widget):
@@ -1101,6 +1205,7 @@ class HICBuildApp(Gtk.Application):
 
 def main():
     """主函数"""
+    setup_stdio()
     app = HICBuildApp()
     app.run(sys.argv)
 
@@ -1109,9 +1214,103 @@ if __name__ == "__main__":
     main()
 
 
+# build_config.mk 中的 "CONFIG_XXX ?= 值    # 注释" 行
+_CONFIG_RE = re.compile(r'^\s*(CONFIG_[A-Z0-9_]+)\s*[?:+]?=\s*([^#]*?)\s*(?:#.*)?$')
+
+
+def _load_spin(widget, value):
+    """设置数字输入框的值，忽略非整数"""
+    if value.lstrip('-').isdigit():
+        widget.set_value(int(value))
+
+
+# 控件类型 -> 从配置值设置控件
+_LOADERS = {
+    Gtk.CheckButton: lambda widget, value: widget.set_active(value == '1'),
+    Gtk.SpinButton: _load_spin,
+    Gtk.ComboBox: lambda widget, value: widget.set_active_id(value),
+}
+
+# 控件类型 -> 读取控件的配置值（None表示未选择，不写入）
+_SAVERS = {
+    Gtk.CheckButton: lambda widget: '1' if widget.get_active() else '0',
+    Gtk.SpinButton: lambda widget: str(int(widget.get_value())),
+    Gtk.ComboBox: lambda widget: widget.get_active_id(),
+}
+
+
 class BuildConfigDialog(Gtk.Dialog):
     """构建配置对话框"""
     
+    # 配置页描述: (标签页名, 标题, 描述或None, 配置项)
+    # 配置项: ("check", 键, 文本, 提示)
+    #         ("spin", 键, 文本, 最小值, 最大值, 默认值)
+    #         ("spin_hint", 键, 文本, 最小值, 最大值, 默认值, 提示)
+    #         ("combo", 键, 文本, ((配置值, 显示文本), ...))
+    PAGES = (
+        ("调试", "调试配置", "调试功能和日志输出", (
+            ("check", "CONFIG_DEBUG", "启用调试支持", "添加调试符号和调试信息，方便使用调试器"),
+            ("check", "CONFIG_TRACE", "启用跟踪功能", "记录函数调用跟踪信息，用于性能分析"),
+            ("check", "CONFIG_VERBOSE", "启用详细输出", "显示详细的编译和运行信息"),
+        )),
+        ("安全", "安全配置", "内核安全防护机制和访问控制", (
+            ("check", "CONFIG_KASLR", "启用KASLR", "内核地址空间布局随机化，增加攻击难度"),
+            ("check", "CONFIG_SMEP", "启用SMEP", "禁止从用户态执行内核代码，防止权限提升"),
+            ("check", "CONFIG_SMAP", "启用SMAP", "禁止内核访问用户态内存，防止数据泄露"),
+            ("check", "CONFIG_AUDIT", "启用审计日志", "记录安全相关事件，便于安全审计"),
+            ("combo", "CONFIG_SECURITY_LEVEL", "安全级别:", (
+                ("minimal", "最低安全"),
+                ("standard", "标准安全"),
+                ("strict", "严格安全"),
+            )),
+        )),
+        ("性能", "性能配置", "性能优化和监控选项", (
+            ("check", "CONFIG_PERF", "启用性能计数器", "启用CPU性能计数器，用于性能分析"),
+            ("check", "CONFIG_FAST_PATH", "启用快速路径", "优化常见操作路径，提升响应速度"),
+        )),
+        ("内存", "内存配置", "内存分配和管理策略", (
+            ("spin_hint", "CONFIG_HEAP_SIZE_MB", "堆大小 (MB):", 16, 4096, 128,
+             "建议值: 128-512MB，根据可用内存调整"),
+            ("spin_hint", "CONFIG_STACK_SIZE_KB", "栈大小 (KB):", 4, 64, 8,
+             "建议值: 8-16KB，大多数应用足够"),
+            ("spin_hint", "CONFIG_PAGE_CACHE_PERCENT", "页面缓存 (%):", 0, 50, 20,
+             "建议值: 20-30%，提升文件系统性能"),
+        )),
+        ("调度器", "调度器配置", "线程调度和任务管理策略", (
+            ("combo", "CONFIG_SCHEDULER_POLICY", "调度策略:", (
+                ("fifo", "FIFO - 先进先出"),
+                ("rr", "轮转调度"),
+                ("priority", "优先级调度"),
+            )),
+            ("spin_hint", "CONFIG_TIME_SLICE_MS", "时间片 (毫秒):", 1, 1000, 10,
+             "建议值: 10-50ms，影响响应速度"),
+            ("spin_hint", "CONFIG_MAX_THREADS", "最大线程数:", 1, 1024, 256,
+             "建议值: 128-512，根据CPU核心数调整"),
+        )),
+        ("功能", "功能配置", "硬件支持和功能模块", (
+            ("check", "CONFIG_PCI", "启用PCI支持", "支持PCI设备，如网卡、显卡等"),
+            ("check", "CONFIG_ACPI", "启用ACPI支持", "支持ACPI电源管理和硬件配置"),
+            ("check", "CONFIG_SERIAL", "启用串口支持", "支持串口控制台输出，便于调试"),
+        )),
+        ("能力系统", "能力系统配置", None, (
+            ("spin", "CONFIG_MAX_CAPABILITIES", "最大能力数量:", 1024, 1048576, 65536),
+            ("check", "CONFIG_CAPABILITY_DERIVATION", "启用能力派生", "允许从现有能力派生新能力"),
+        )),
+        ("域", "域配置", None, (
+            ("spin", "CONFIG_MAX_DOMAINS", "最大域数量:", 1, 128, 16),
+            ("spin", "CONFIG_DOMAIN_STACK_SIZE_KB", "域栈大小 (KB):", 8, 64, 16),
+        )),
+        ("中断", "中断配置", None, (
+            ("spin", "CONFIG_MAX_IRQS", "最大中断数:", 64, 1024, 256),
+            ("check", "CONFIG_IRQ_FAIRNESS", "启用中断公平性", "确保中断处理的公平性"),
+        )),
+        ("模块", "模块配置", "内核模块加载和管理", (
+            ("check", "CONFIG_MODULE_LOADING", "启用模块加载", "允许在运行时加载内核模块"),
+            ("spin_hint", "CONFIG_MAX_MODULES", "最大模块数:", 0, 256, 32,
+             "建议值: 16-64，根据需求调整"),
+        )),
+    )
+    
     def __init__(self, parent, build_system):
         super().__init__(
             title="HIC内核配置",
@@ -1119,7 +1318,16 @@ class BuildConfigDialog(Gtk.Dialog):
             flags=0
         )
         self.build_system = build_system
-        self.config_vars = {}
+        # 控件类型 -> {配置键: 控件}，加载和保存时每种类型一个循环
+        self.config_vars = {widget_type: {} for widget_type in _LOADERS}
+        # 最近一次加载/保存的配置文件内容，保存时在其基础上改写
+        self._config_text = ""
+        # 上述内容解析出的 键 -> 值，以及对应文件版本的etag（未加载时为None）
+        self._config_values = {}
+        self._config_etag = None
+        # _config_text是否与磁盘上的文件一致（文件不存在也算），否则不允许保存
+        self._config_loaded = False
+        self._config_gfile = Gio.File.new_for_path(str(CONFIG_FILE))
         
         self.add_button("取消", Gtk.ResponseType.CANCEL)
         self.add_button("应用", Gtk.ResponseType.APPLY)
@@ -1128,14 +1336,14 @@ class BuildConfigDialog(Gtk.Dialog):
         self.set_default_size(700, 550)
         self.set_border_width(10)
         
-        # 创建配置界面
-        self.create_config_ui()
+        # 页面边距由样式表统一设置
+        install_page_css(self.get_screen())
         
-        # 加载当前配置
-        self.load_config()
+        # 创建配置界面（配置值在每次run时加载，欢迎信息也在其中创建）
+        self.create_config_ui()
         
-        # 显示欢迎信息
-        self.show_welcome_info()
+        # 对话框在多次打开间复用，关闭窗口时只隐藏
+        self.connect("delete-event", lambda widget, event: widget.hide_on_delete())
     
     def create_config_ui(self):
         """创建配置界面"""
@@ -1146,10 +1354,7 @@ class BuildConfigDialog(Gtk.Dialog):
         # 欢迎信息区域
         self.welcome_frame = Gtk.Frame()
         welcome_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        welcome_box.set_margin_top(10)
-        welcome_box.set_margin_bottom(10)
-        welcome_box.set_margin_start(10)
-        welcome_box.set_margin_end(10)
+        welcome_box.get_style_context().add_class("page-body")
         
         welcome_label = Gtk.Label()
         welcome_label.set_markup("<b>🎯 欢迎使用HIC内核配置工具</b>")
@@ -1159,7 +1364,7 @@ class BuildConfigDialog(Gtk.Dialog):
         info_label = Gtk.Label()
         info_label.set_markup("<small>通过这些选项来自定义内核的行为和特性。修改后需要重新编译才能生效。</small>")
         info_label.set_halign(Gtk.Align.START)
-        info_label.set_wrap(True)
+        info_label.set_line_wrap(True)
         welcome_box.pack_start(info_label, False, False, 0)
         
         self.welcome_frame.add(welcome_box)
@@ -1169,24 +1374,30 @@ class BuildConfigDialog(Gtk.Dialog):
         notebook = Gtk.Notebook()
         main_box.pack_start(notebook, True, True, 0)
         
-        # 创建各个配置页
-        self.create_debug_page(notebook)
-        self.create_security_page(notebook)
-        self.create_performance_page(notebook)
-        self.create_memory_page(notebook)
-        self.create_scheduler_page(notebook)
-        self.create_feature_page(notebook)
-        self.create_capability_page(notebook)
-        self.create_domain_page(notebook)
-        self.create_interrupt_page(notebook)
-        self.create_module_page(notebook)
-    
-    def show_welcome_info(self):
-        """显示欢迎信息"""
-    
-    def show_welcome_info(self):
-        """显示欢迎信息"""
-        pass  # 欢迎信息已在create_config_ui中添加
+        # 先只创建空白页和标签，页面内容在第一次切换到该页时才创建
+        # 尚未创建内容的页: 页号 -> PAGES中的描述
+        self._pending_pages = {}
+        for tab_label, *page in self.PAGES:
+            container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            page_num = notebook.append_page(container, Gtk.Label.new(tab_label))
+            self._pending_pages[page_num] = page
+        
+        notebook.connect("switch-page", self._on_page_switched)
+        
+        # 当前显示的第一页立即创建
+        current = notebook.get_current_page()
+        self._on_page_switched(notebook, notebook.get_nth_page(current), current)
+        
+        main_box.show_all()
+    
+    def _on_page_switched(self, notebook, page, page_num):
+        """切换到尚未创建内容的配置页时创建其内容"""
+        spec = self._pending_pages.pop(page_num, None)
+        if spec is None:
+            return
+        box = self._build_page(*spec)
+        page.pack_start(box, True, True, 0)
+        box.show_all()
     
     def create_check_button(self, parent, label_text, tooltip_text):
         """创建复选框"""
@@ -1212,197 +1423,25 @@ class BuildConfigDialog(Gtk.Dialog):
         parent.pack_start(hbox, False, False, 0)
         return spin
     
-    def create_debug_page(self, notebook):
-        """创建调试配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>调试配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>调试功能和日志输出</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # 调试支持
-        self.config_vars['CONFIG_DEBUG'] = self.create_check_button(
-            box, "启用调试支持", "添加调试符号和调试信息，方便使用调试器"
-        )
-        
-        # 跟踪功能
-        self.config_vars['CONFIG_TRACE'] = self.create_check_button(
-            box, "启用跟踪功能", "记录函数调用跟踪信息，用于性能分析"
-        )
-        
-        # 详细输出
-        self.config_vars['CONFIG_VERBOSE'] = self.create_check_button(
-            box, "启用详细输出", "显示详细的编译和运行信息"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new(self._("debug_tab")))
-    
-    def create_security_page(self, notebook):
-        """创建安全配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>安全配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>内核安全防护机制和访问控制</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # KASLR
-        self.config_vars['CONFIG_KASLR'] = self.create_check_button(
-            box, "启用KASLR", "内核地址空间布局随机化，增加攻击难度"
-        )
+    def _create_combo(self, parent, label_text, choices):
+        """创建下拉框，choices为 (配置值, 显示文本) 序列"""
+        store = Gtk.ListStore(str, str)
+        for value, description in choices:
+            store.append([description, value])
         
-        # SMEP
-        self.config_vars['CONFIG_SMEP'] = self.create_check_button(
-            box, "启用SMEP", "禁止从用户态执行内核代码，防止权限提升"
-        )
-        
-        # SMAP
-        self.config_vars['CONFIG_SMAP'] = self.create_check_button(
-            box, "启用SMAP", "禁止内核访问用户态内存，防止数据泄露"
-        )
-        
-        # 审计日志
-        self.config_vars['CONFIG_AUDIT'] = self.create_check_button(
-            box, "启用审计日志", "记录安全相关事件，便于安全审计"
-        )
-        
-        # 安全级别
-        security_levels = Gtk.ListStore(str)
-        level_descriptions = {
-            "minimal": "最低安全",
-            "standard": "标准安全",
-            "strict": "严格安全"
-        }
-        for level in ["minimal", "standard", "strict"]:
-            security_levels.append([level_descriptions.get(level, level)])
-        
-        combo = Gtk.ComboBox.new_with_model(security_levels)
+        combo = Gtk.ComboBox.new_with_model(store)
+        combo.set_id_column(1)
         renderer = Gtk.CellRendererText()
         combo.pack_start(renderer, True)
         combo.add_attribute(renderer, "text", 0)
         
         hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        label = Gtk.Label.new("安全级别:")
+        label = Gtk.Label.new(label_text)
         label.set_halign(Gtk.Align.START)
         hbox.pack_start(label, False, False, 0)
         hbox.pack_start(combo, True, True, 0)
-        box.pack_start(hbox, False, False, 0)
-        
-        self.config_vars['CONFIG_SECURITY_LEVEL'] = combo
-        
-        notebook.append_page(box, Gtk.Label.new(self._("security")))
-    
-    def create_performance_page(self, notebook):
-        """创建性能配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>性能配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>性能优化和监控选项</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # 性能计数器
-        self.config_vars['CONFIG_PERF'] = self.create_check_button(
-            box, "启用性能计数器", "启用CPU性能计数器，用于性能分析"
-        )
-        
-        # 快速路径
-        self.config_vars['CONFIG_FAST_PATH'] = self.create_check_button(
-            box, "启用快速路径", "优化常见操作路径，提升响应速度"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new(self._("performance_tab")))
-    
-    def create_memory_page(self, notebook):
-        """创建内存配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>内存配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>内存分配和管理策略</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # 堆大小
-        self.config_vars['CONFIG_HEAP_SIZE_MB'] = self.create_spin_button_with_hint(
-            box, "堆大小 (MB):", 16, 4096, 128, "建议值: 128-512MB，根据可用内存调整"
-        )
-        
-        # 栈大小
-        self.config_vars['CONFIG_STACK_SIZE_KB'] = self.create_spin_button_with_hint(
-            box, "栈大小 (KB):", 4, 64, 8, "建议值: 8-16KB，大多数应用足够"
-        )
-        
-        # 页面缓存
-        self.config_vars['CONFIG_PAGE_CACHE_PERCENT'] = self.create_spin_button_with_hint(
-            box, "页面缓存 (%):", 0, 50, 20, "建议值: 20-30%，提升文件系统性能"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new(self._("memory")))
+        parent.pack_start(hbox, False, False, 0)
+        return combo
     
     def create_spin_button_with_hint(self, parent, label_text, min_val, max_val, default_val, hint_text):
         """创建带提示的数字输入框"""
@@ -1425,308 +1464,255 @@ class BuildConfigDialog(Gtk.Dialog):
         hint_label = Gtk.Label()
         hint_label.set_markup(f"<small><i>{hint_text}</i></small>")
         hint_label.set_halign(Gtk.Align.START)
-        hint_label.set_wrap(True)
+        hint_label.set_line_wrap(True)
         vbox.pack_start(hint_label, False, False, 0)
         
         parent.pack_start(vbox, False, False, 0)
         return spin
     
-    def create_feature_page(self, notebook):
-        """创建功能配置页"""
+    def _build_page(self, header, description, items):
+        """按PAGES中的描述创建一个配置页的内容，控件取已加载的配置值"""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
+        box.get_style_context().add_class("page-body")
         
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         title_label = Gtk.Label()
-        title_label.set_markup("<b>功能配置</b>")
+        title_label.set_markup(f"<b>{header}</b>")
         title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>硬件支持和功能模块</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # PCI支持
-        self.config_vars['CONFIG_PCI'] = self.create_check_button(
-            box, "启用PCI支持", "支持PCI设备，如网卡、显卡等"
-        )
-        
-        # ACPI支持
-        self.config_vars['CONFIG_ACPI'] = self.create_check_button(
-            box, "启用ACPI支持", "支持ACPI电源管理和硬件配置"
-        )
-        
-        # 串口支持
-        self.config_vars['CONFIG_SERIAL'] = self.create_check_button(
-            box, "启用串口支持", "支持串口控制台输出，便于调试"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new("功能"))
-    
-    def create_capability_page(self, notebook):
-        """创建能力系统配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        label = Gtk.Label()
-        label.set_markup("<b>能力系统配置</b>")
-        label.set_halign(Gtk.Align.START)
-        box.pack_start(label, False, False, 0)
-        
-        # 最大能力数量
-        self.config_vars['CONFIG_MAX_CAPABILITIES'] = self.create_spin_button(
-            box, "最大能力数量:", 1024, 1048576, 65536
-        )
-        
-        # 能力派生
-        self.config_vars['CONFIG_CAPABILITY_DERIVATION'] = self.create_check_button(
-            box, "启用能力派生", "允许从现有能力派生新能力"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new("能力系统"))
-    
-    def create_domain_page(self, notebook):
-        """创建域配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        label = Gtk.Label()
-        label.set_markup("<b>域配置</b>")
-        label.set_halign(Gtk.Align.START)
-        box.pack_start(label, False, False, 0)
-        
-        # 最大域数量
-        self.config_vars['CONFIG_MAX_DOMAINS'] = self.create_spin_button(
-            box, "最大域数量:", 1, 128, 16
-        )
-        
-        # 域栈大小
-        self.config_vars['CONFIG_DOMAIN_STACK_SIZE_KB'] = self.create_spin_button(
-            box, "域栈大小 (KB):", 8, 64, 16
-        )
+        if description is None:
+            box.pack_start(title_label, False, False, 0)
+        else:
+            # 标题和描述
+            title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+            title_box.pack_start(title_label, False, False, 0)
+            
+            desc_label = Gtk.Label()
+            desc_label.set_markup(f"<small>{description}</small>")
+            desc_label.set_halign(Gtk.Align.START)
+            title_box.pack_start(desc_label, True, True, 0)
+            box.pack_start(title_box, False, False, 0)
+            
+            # 分隔线
+            separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
+            box.pack_start(separator, False, False, 5)
+        
+        for kind, key, *args in items:
+            if kind == "check":
+                widget = self.create_check_button(box, *args)
+            elif kind == "spin":
+                widget = self.create_spin_button(box, *args)
+            elif kind == "spin_hint":
+                widget = self.create_spin_button_with_hint(box, *args)
+            else:
+                widget = self._create_combo(box, *args)
+            self.config_vars[type(widget)][key] = widget
+            value = self._config_values.get(key)
+            if value is not None:
+                _LOADERS[type(widget)](widget, value)
         
-        notebook.append_page(box, Gtk.Label.new("域"))
+        return box
     
-    def create_interrupt_page(self, notebook):
-        """创建中断配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        label = Gtk.Label()
-        label.set_markup("<b>中断配置</b>")
-        label.set_halign(Gtk.Align.START)
-        box.pack_start(label, False, False, 0)
-        
-        # 最大中断数
-        self.config_vars['CONFIG_MAX_IRQS'] = self.create_spin_button(
-            box, "最大中断数:", 64, 1024, 256
-        )
-        
-        # 中断公平性
-        self.config_vars['CONFIG_IRQ_FAIRNESS'] = self.create_check_button(
-            box, "启用中断公平性", "确保中断处理的公平性"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new("中断"))
+    def load_config(self):
+        """异步加载当前配置，读取由GIO在后台完成"""
+        gfile = self._config_gfile
+        if self._config_etag is None:
+            gfile.load_contents_async(None, self._on_config_loaded)
+        else:
+            # 已有解析结果时先比较etag，文件未变则不再读取和解析
+            gfile.query_info_async(Gio.FILE_ATTRIBUTE_ETAG_VALUE, Gio.FileQueryInfoFlags.NONE,
+                                   GLib.PRIORITY_DEFAULT, None, self._on_config_queried)
     
-    def create_module_page(self, notebook):
-        """创建模块配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>模块配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>内核模块加载和管理</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # 模块加载
-        self.config_vars['CONFIG_MODULE_LOADING'] = self.create_check_button(
-            box, "启用模块加载", "允许在运行时加载内核模块"
-        )
-        
-        # 最大模块数
-        self.config_vars['CONFIG_MAX_MODULES'] = self.create_spin_button_with_hint(
-            box, "最大模块数:", 0, 256, 32, "建议值: 16-64，根据需求调整"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new("模块"))
-        
-    def create_scheduler_page(self, notebook):
-        """创建调度器配置页"""
-        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        box.set_margin_top(10)
-        box.set_margin_bottom(10)
-        box.set_margin_start(10)
-        box.set_margin_end(10)
-        
-        # 标题和描述
-        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        title_label = Gtk.Label()
-        title_label.set_markup("<b>调度器配置</b>")
-        title_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(title_label, False, False, 0)
-        
-        desc_label = Gtk.Label()
-        desc_label.set_markup("<small>线程调度和任务管理策略</small>")
-        desc_label.set_halign(Gtk.Align.START)
-        title_box.pack_start(desc_label, True, True, 0)
-        box.pack_start(title_box, False, False, 0)
-        
-        # 分隔线
-        separator = Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL)
-        box.pack_start(separator, False, False, 5)
-        
-        # 调度策略
-        policies = Gtk.ListStore(str)
-        policy_descriptions = {
-            "fifo": "FIFO - 先进先出",
-            "rr": "轮转调度",
-            "priority": "优先级调度"
-        }
-        for policy in ["fifo", "rr", "priority"]:
-            policies.append([policy_descriptions.get(policy, policy)])
-        
-        combo = Gtk.ComboBox.new_with_model(policies)
-        renderer = Gtk.CellRendererText()
-        combo.pack_start(renderer, True)
-        combo.add_attribute(renderer, "text", 0)
-        
-        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        label = Gtk.Label.new(self._("scheduler_policy") + ":")
-        label.set_halign(Gtk.Align.START)
-        hbox.pack_start(label, False, False, 0)
-        hbox.pack_start(combo, True, True, 0)
-        box.pack_start(hbox, False, False, 0)
-        
-        self.config_vars['CONFIG_SCHEDULER_POLICY'] = combo
-        
-        # 时间片
-        self.config_vars['CONFIG_TIME_SLICE_MS'] = self.create_spin_button_with_hint(
-            box, "时间片 (毫秒):", 1, 1000, 10, "建议值: 10-50ms，影响响应速度"
-        )
-        
-        # 最大线程数
-        self.config_vars['CONFIG_MAX_THREADS'] = self.create_spin_button_with_hint(
-            box, "最大线程数:", 1, 1024, 256, "建议值: 128-512，根据CPU核心数调整"
-        )
-        
-        notebook.append_page(box, Gtk.Label.new(self._("scheduler")))
+    def _on_config_queried(self, gfile, result):
+        """etag查询完成，文件变化时重新读取"""
+        try:
+            etag = gfile.query_info_finish(result).get_etag()
+        except GLib.Error:
+            etag = None
+        if etag is not None and etag == self._config_etag:
+            self._apply_config()
+        else:
+            gfile.load_contents_async(None, self._on_config_loaded)
     
-    def load_config(self):
-        """加载当前配置"""
-        config_file = os.path.join(ROOT_DIR, "..", "build_config.mk")
-        
-        if not os.path.exists(config_file):
+    def _on_config_loaded(self, gfile, result):
+        """配置文件读取完成，解析后把值应用到控件"""
+        self._config_values = {}
+        self._config_etag = None
+        try:
+            _ok, data, etag = gfile.load_contents_finish(result)
+            text = data.decode('utf-8')
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.NOT_FOUND):
+                self._refuse_save(f"读取配置文件失败: {e.message}")
+                return
+            # 配置文件不存在时保持控件默认值，保存时新建文件
+            text = ""
+            etag = None
+        except UnicodeDecodeError as e:
+            self._refuse_save(f"配置文件不是有效的UTF-8文本: {e}")
             return
         
-        with open(config_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('CONFIG_') and '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip().rstrip('?')
-                    
-                    if key in self.config_vars:
-                        widget = self.config_vars[key]
-                        
-                        if isinstance(widget, Gtk.CheckButton):
-                            widget.set_active(value == '1')
-                        elif isinstance(widget, Gtk.SpinButton):
-                            try:
-                                widget.set_value(int(value))
-                            except ValueError:
-                                pass
-                        elif isinstance(widget, Gtk.ComboBox):
-                            # 设置组合框的值
-                            pass  # 需要实现
+        self._config_text = text
+        self._config_etag = etag
+        self._config_loaded = True
+        
+        # 一次扫描得到 键 -> 值
+        lines = self._config_text.splitlines()
+        self._config_values = {m.group(1): m.group(2) for m in map(_CONFIG_RE.match, lines) if m}
+        self._apply_config()
+    
+    def _apply_config(self):
+        """按控件类型分派，把已解析的配置值设置到控件"""
+        parsed = self._config_values
+        for widget_type, widgets in self.config_vars.items():
+            load = _LOADERS[widget_type]
+            for key, widget in widgets.items():
+                value = parsed.get(key)
+                if value is not None:
+                    load(widget, value)
+        # 配置已与文件一致，允许保存
+        self._set_save_sensitive(True)
+    
+    def _set_save_sensitive(self, sensitive: bool):
+        """设置“应用”“确定”按钮是否可用"""
+        self.set_response_sensitive(Gtk.ResponseType.APPLY, sensitive)
+        self.set_response_sensitive(Gtk.ResponseType.OK, sensitive)
+    
+    def _refuse_save(self, reason: str):
+        """配置文件无法正确读取：保存会覆盖掉未读取的内容，因此禁止保存"""
+        self._config_loaded = False
+        self._config_text = ""
+        self.build_system.log(f"{reason}，为避免覆盖原文件，本次不能保存配置", "error")
     
     def save_config(self):
         """保存配置"""
-        config_file = os.path.join(ROOT_DIR, "..", "build_config.mk")
-        
-        # 读取原文件
-        lines = []
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                lines = f.readlines()
+        if not self._config_loaded:
+            self.build_system.log("配置文件尚未成功读取，未保存配置", "error")
+            return False
         
-        # 更新配置值
+        # 按控件类型分派读取配置值
         config_values = {}
-        for key, widget in self.config_vars.items():
-            if isinstance(widget, Gtk.CheckButton):
-                config_values[key] = '1' if widget.get_active() else '0'
-            elif isinstance(widget, Gtk.SpinButton):
-                config_values[key] = str(int(widget.get_value()))
-            elif isinstance(widget, Gtk.ComboBox):
-                # 获取组合框的值
-                pass  # 需要实现
-        
-        # 更新文件内容
-        new_lines = []
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('CONFIG_') and '=' in stripped:
-                key = stripped.split('=', 1)[0].strip()
-                if key in config_values:
-                    new_lines.append(f"{key} ?= {config_values[key]}\n")
-                    continue
-            new_lines.append(line)
-        
-        # 写回文件
-        with open(config_file, 'w') as f:
-            f.writelines(new_lines)
+        for widget_type, widgets in self.config_vars.items():
+            save = _SAVERS[widget_type]
+            for key, widget in widgets.items():
+                value = save(widget)
+                if value is not None:
+                    config_values[key] = value
+        
+        # 在内存中逐行改写上次加载的内容
+        written = set()
+        out = []
+        for line in self._config_text.splitlines(keepends=True):
+            m = _CONFIG_RE.match(line)
+            if m and m.group(1) in config_values:
+                # 只替换值，保留对齐和行尾注释
+                key = m.group(1)
+                line = line[:m.start(2)] + config_values[key] + line[m.end(2):]
+                written.add(key)
+            out.append(line)
+        
+        # 原文件中没有的配置项追加到末尾
+        missing = [key for key in config_values if key not in written]
+        if missing and out and not out[-1].endswith("\n"):
+            out.append("\n")
+        for key in missing:
+            out.append(f"{key} ?= {config_values[key]}\n")
+        
+        self._config_text = "".join(out)
+        self._config_values.update(config_values)
+        
+        # GIO在后台写入临时文件并原子替换原文件；
+        # 带上加载时的etag，文件在对话框打开期间被其他程序修改时写入失败而不是覆盖
+        self._config_gfile.replace_contents_bytes_async(
+            GLib.Bytes.new(self._config_text.encode('utf-8')), self._config_etag, False,
+            Gio.FileCreateFlags.NONE, None, self._on_config_saved)
         
         return True
     
+    def _on_config_saved(self, gfile, result):
+        """配置文件写入完成"""
+        try:
+            _ok, self._config_etag = gfile.replace_contents_finish(result)
+        except GLib.Error as e:
+            # 内存中的内容已不可信，下次打开时重新读取
+            self._config_etag = None
+            self._config_loaded = False
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.WRONG_ETAG):
+                self.build_system.log("配置文件已被其他程序修改，本次修改未保存，请重新打开配置对话框", "error")
+            else:
+                self.build_system.log(f"保存配置失败: {e.message}", "error")
+            return
+        
+        self.build_system.log("配置已保存", "success")
+        self.build_system.log("需要重新编译才能使配置生效", "info")
+    
     def run(self):
         """运行对话框"""
+        # 每次打开都重新读取配置文件，控件本身保留复用；
+        # 读取完成前不允许保存，否则会用不完整的内容覆盖文件
+        self._set_save_sensitive(False)
+        self.load_config()
         response = super().run()
         
         if response in [Gtk.ResponseType.APPLY, Gtk.ResponseType.OK]:
             self.save_config()
         
-        self.destroy()
+        self.hide()
         return response
 
 
+def clean_build_command(build_type: str) -> tuple[str, ...]:
+    """清理并并行构建，合并为一次shell调用"""
+    return ("sh", "-c", f'make clean && make -j"$(nproc)" BUILD_TYPE={build_type}')
+
+
+# 构建按钮对应的固定命令，启动时生成一次，之后每次点击直接复用
+_CMD_CLEAN = ("make", "clean")
+_CMD_CONSOLE = clean_build_command("console")
+_CMD_TUI = clean_build_command("tui")
+_CMD_GUI = clean_build_command("gui")
+# 命令在GUI中运行，无法回答pacman的确认提示，必须带 --noconfirm；
+# 命令在独立会话中运行、没有控制终端，sudo无法询问密码，改用pkexec由polkit弹出图形化认证窗口
+HAS_PKEXEC = shutil.which("pkexec") is not None
+_CMD_DEPS_ARCH = ("pkexec", "pacman", "-S", "--needed", "--noconfirm", "base-devel",
+                  "git", "mingw-w64-gcc", "gnu-efi", "ncurses", "gtk3")
+
+# 构建命令放在独立会话（进程组）中，关闭窗口时可连同其派生的子进程一起终止
+NEW_SESSION = ("setsid",) if shutil.which("setsid") else ()
+
+
+def _create_log_tag_table() -> Gtk.TextTagTable:
+    """创建日志级别对应的文本标签表"""
+    table = Gtk.TextTagTable()
+    for name, color in (("default", "black"), ("error", "red"), ("success", "green"),
+                        ("warning", "orange"), ("info", "blue")):
+        table.add(Gtk.TextTag(name=name, foreground=color))
+    return table
+
+
+# 所有日志视图共用一张标签表
+_LOG_TAG_TABLE = _create_log_tag_table()
+
+
 class BuildLogTextView(Gtk.TextView):
     """构建日志文本视图"""
     
+    # 待写入行队列上限，以及每次定时回调写入的最大行数
+    PENDING_MAX = 8192
+    DRAIN_BATCH = 256
+    # 写入节拍（毫秒），约60Hz
+    DRAIN_INTERVAL_MS = 16
+    # 缓冲区保留的最大行数，超出后从头部删除
+    MAX_LINES = LOG_MAX_LINES
+    # 积压超过该行数时一次性全部写入，写入期间把缓冲区从视图上摘下
+    BULK_THRESHOLD = 1000
+    # 级别 -> 行前缀，未列出的级别按大写名称生成
+    _LEVEL_PREFIX = {
+        "default": "[DEFAULT] ",
+        "error": "[ERROR] ",
+        "success": "[SUCCESS] ",
+        "warning": "[WARNING] ",
+        "info": "[INFO] ",
+    }
+    
     def __init__(self):
         super().__init__()
         self.set_editable(False)
@@ -1736,82 +1722,260 @@ class BuildLogTextView(Gtk.TextView):
         self.set_top_margin(10)
         self.set_bottom_margin(10)
         
-        # 创建标签
-        self.buffer = self.get_buffer()
-        self.tag_default = self.buffer.create_tag("default")
-        self.tag_default.set_property("foreground", "black")
-        
-        self.tag_error = self.buffer.create_tag("error")
-        self.tag_error.set_property("foreground", "red")
-        
-        self.tag_success = self.buffer.create_tag("success")
-        self.tag_success.set_property("foreground", "green")
-        
-        self.tag_warning = self.buffer.create_tag("warning")
-        self.tag_warning.set_property("foreground", "orange")
+        # 缓冲区使用共享标签表
+        self.buffer = Gtk.TextBuffer(tag_table=_LOG_TAG_TABLE)
+        self.set_buffer(self.buffer)
+        self.tag_default = _LOG_TAG_TABLE.lookup("default")
+        self.tag_error = _LOG_TAG_TABLE.lookup("error")
+        self.tag_success = _LOG_TAG_TABLE.lookup("success")
+        self.tag_warning = _LOG_TAG_TABLE.lookup("warning")
+        self.tag_info = _LOG_TAG_TABLE.lookup("info")
+        
+        # 级别 -> 标签 查找表
+        self._tags = {
+            "error": self.tag_error,
+            "success": self.tag_success,
+            "warning": self.tag_warning,
+            "info": self.tag_info,
+        }
         
-        self.tag_info = self.buffer.create_tag("info")
-        self.tag_info.set_property("foreground", "blue")
-    
-    def log(self, message: str, level: str = "info"):
-        """添加日志消息"""
-        end_iter = self.buffer.get_end_iter()
-        
-        # 选择标签
-        if level == "error":
-            tag = self.tag_error
-        elif level == "success":
-            tag = self.tag_success
-        elif level == "warning":
-            tag = self.tag_warning
-        elif level == "info":
-            tag = self.tag_info
+        # 待写入的日志行，由任意线程追加，在主线程批量写入
+        self._pending = collections.deque(maxlen=self.PENDING_MAX)
+        self._pending_lock = threading.Lock()
+        self._source_id = None
+        self._line_count = 0
+        # 批量写入时临时挂在视图上的空缓冲区
+        self._detached_buffer = Gtk.TextBuffer()
+    
+    def log(self, message: str, level: str = "info", *args):
+        """添加日志消息（线程安全，批量写入缓冲区）
+        
+        带args时message按%格式化，格式化推迟到真正写入缓冲区时进行
+        """
+        # deque的append/popleft本身是线程安全的，只有调度写入回调时才加锁；
+        # _drain在锁内检查队列并清除_source_id，这里先追加、再在锁内检查，不会丢失日志。
+        # _source_id只能在锁内读取：锁外读到的旧值可能正被_drain清除
+        self._pending.append((message, level, args))
+        with self._pending_lock:
+            if self._source_id is not None:
+                return
+            # 按固定节拍写入而不是持续空闲回调，突发输出自然合并，唤醒次数有上限。
+            # GTK的重新布局/重绘运行在 PRIORITY_HIGH_IDLE + 10/+20（110/120），
+            # 日志写入放在 PRIORITY_LOW（300），大量输出时也不会抢占界面绘制
+            self._source_id = GLib.timeout_add(self.DRAIN_INTERVAL_MS, self._drain,
+                                               priority=GLib.PRIORITY_LOW)
+    
+    def _drain(self):
+        """定时回调：取出一批日志，按级别合并后写入缓冲区"""
+        pending = len(self._pending)
+        bulk = pending > self.BULK_THRESHOLD
+        count = pending if bulk else min(pending, self.DRAIN_BATCH)
+        batch = [self._pending.popleft() for _ in range(count)]
+        
+        if bulk:
+            # 大量积压：写入期间视图不跟踪缓冲区变化，重新挂上后只布局一次
+            self.freeze_notify()
+            self.set_buffer(self._detached_buffer)
+            try:
+                self._write_batch(batch)
+            finally:
+                self.set_buffer(self.buffer)
+                self.thaw_notify()
         else:
-            tag = self.tag_default
+            self.buffer.begin_user_action()
+            self._write_batch(batch)
+            self.buffer.end_user_action()
         
-        # 添加文本
-        self.buffer.insert_with_tags(end_iter, f"[{level.upper()}] {message}\n", tag)
+        if batch:
+            # 自动滚动到底部
+            self.scroll_to_mark(self.buffer.get_insert(), 0.25, False, 0.0, 1.0)
         
-        # 自动滚动到底部
-        self.scroll_to_mark(self.buffer.get_insert(), 0.25, False, 0.0, 1.0)
+        with self._pending_lock:
+            if self._pending:
+                return True
+            self._source_id = None
+            return False
+    
+    def _write_batch(self, batch):
+        """写入一批日志并裁剪缓冲区"""
+        # 连续同级别的行合并为一次插入
+        group = []
+        group_level = None
+        for message, level, args in batch:
+            if level != group_level and group:
+                self._insert_group(group, group_level)
+                group = []
+            group_level = level
+            group.append(message % args if args else message)
+        if group:
+            self._insert_group(group, group_level)
+        
+        self._trim()
+    
+    def _insert_group(self, messages, level: str):
+        """将同级别的一组消息一次性写入缓冲区"""
+        prefix = self._LEVEL_PREFIX.get(level) or f"[{level.upper()}] "
+        # 一次join生成整段文本，不为每行单独拼接字符串
+        text = prefix + ("\n" + prefix).join(messages) + "\n"
+        self.buffer.insert_with_tags(self.buffer.get_end_iter(), text,
+                                     self._tags.get(level, self.tag_default))
+        # 按实际换行计数，消息自身带换行时行数上限仍然准确
+        self._line_count += text.count("\n")
+    
+    def _trim(self):
+        """超出行数上限时从缓冲区头部删除旧行"""
+        excess = self._line_count - self.MAX_LINES
+        if excess <= 0:
+            return
+        start = self.buffer.get_start_iter()
+        cut = self.buffer.get_iter_at_line(excess)
+        self.buffer.delete(start, cut)
+        self._line_count = self.MAX_LINES
     
     def clear(self):
         """清空日志"""
+        with self._pending_lock:
+            self._pending.clear()
+            # 队列已空，取消已调度的写入回调，避免一次空转唤醒
+            if self._source_id is not None:
+                GLib.source_remove(self._source_id)
+                self._source_id = None
         self.buffer.set_text("")
+        self._line_count = 0
 
 
 class BuildButton(Gtk.Button):
     """构建按钮"""
     
+    # 两次点击的最小间隔（微秒）
+    DEBOUNCE_US = 250 * 1000
+    
     def __init__(self, label: str, icon_name: str, callback):
-        super().__init__()
+        super().__init__(label=label)
         self.callback = callback
-        self.set_sensitive(True)
-        
-        # 创建图标
-        image = Gtk.Image()
-        image.set_from_icon_name(icon_name, Gtk.IconSize.BUTTON)
+        self._building = False
+        self._last_click = 0
         
-        # 创建标签
-        label_widget = Gtk.Label.new(label)
+        # 图标和标签由GtkButton自身布局，不再手动组装Box
+        self.set_image(Gtk.Image.new_from_icon_name(icon_name, Gtk.IconSize.BUTTON))
+        self.set_always_show_image(True)
         
-        # 创建水平布局
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        box.pack_start(image, False, False, 0)
-        box.pack_start(label_widget, False, False, 0)
-        
-        self.add(box)
         self.connect("clicked", self.on_clicked)
     
     def on_clicked(self, button):
         """按钮点击事件"""
-        self.callback()
+        now = GLib.get_monotonic_time()
+        if now - self._last_click < self.DEBOUNCE_US:
+            return
+        self._last_click = now
+        
+        # 回调执行期间先禁用按钮，防止连击重复触发
+        self.set_sensitive(False)
+        try:
+            self.callback()
+        finally:
+            # 回调启动了构建时保持禁用，由set_building(False)恢复
+            if not self._building:
+                self.set_sensitive(True)
     
     def set_building(self, building: bool):
         """设置构建状态"""
+        self._building = building
         self.set_sensitive(not building)
 
 
+class _CommandOutput:
+    """一条命令的输出状态：行切分残留、是否读到EOF、退出码"""
+    
+    __slots__ = ("proc", "tail", "eof", "return_code")
+    
+    def __init__(self, proc):
+        self.proc = proc
+        self.tail = b""
+        self.eof = False
+        self.return_code = None
+
+
+class BuildWorker:
+    """逐条执行构建命令
+    
+    每条命令由Gio直接派生，stderr合并到stdout，输出在主循环中异步读取，
+    读到EOF且进程退出后报告返回码。
+    """
+    
+    def __init__(self, on_line, on_done):
+        self._on_line = on_line
+        self._on_done = on_done
+        self._proc = None
+    
+    def run(self, command: Sequence[str]):
+        """启动一条命令"""
+        launcher = Gio.SubprocessLauncher.new(
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_MERGE)
+        launcher.set_cwd(str(ROOT_DIR))
+        proc = launcher.spawnv([*NEW_SESSION, *LINE_BUFFERED, *command])
+        self._proc = proc
+        
+        out = _CommandOutput(proc)
+        stdout = proc.get_stdout_pipe()
+        enlarge_pipe(stdout.get_fd())
+        stdout.read_bytes_async(PIPE_READ_SIZE, GLib.PRIORITY_DEFAULT, None, self._on_read, out)
+        proc.wait_async(None, self._on_exit, out)
+    
+    def stop(self):
+        """终止正在执行的命令，不再报告其结果"""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        pid = proc.get_identifier()
+        if NEW_SESSION and pid is not None:
+            try:
+                os.killpg(int(pid), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        else:
+            proc.send_signal(signal.SIGTERM)
+    
+    def _on_read(self, stream, result, out: _CommandOutput):
+        """命令输出到达：按块读取原始字节，再按行切分"""
+        try:
+            chunk = stream.read_bytes_finish(result).get_data()
+        except GLib.Error as e:
+            # 输出无法再读取：结束命令（否则它会阻塞在写满的管道上），结果视为失败
+            self._on_line(f"读取构建输出失败: {e.message}".encode("utf-8"))
+            out.proc.force_exit()
+            out.return_code = -1
+            chunk = b""
+        
+        if not chunk:
+            if out.tail:
+                self._on_line(out.tail)
+                out.tail = b""
+            out.eof = True
+            self._finish(out)
+            return
+        
+        *lines, out.tail = (out.tail + chunk).split(b"\n")
+        for line in lines:
+            self._on_line(line)
+        
+        stream.read_bytes_async(PIPE_READ_SIZE, GLib.PRIORITY_DEFAULT, None, self._on_read, out)
+    
+    def _on_exit(self, proc, result, out: _CommandOutput):
+        """命令进程退出"""
+        proc.wait_finish(result)
+        if out.return_code is None:
+            out.return_code = proc.get_exit_status() if proc.get_if_exited() else -1
+        self._finish(out)
+    
+    def _finish(self, out: _CommandOutput):
+        """输出读完且进程已退出时报告返回码；已被stop的命令不再报告"""
+        if not out.eof or out.return_code is None or out.proc is not self._proc:
+            return
+        self._proc = None
+        self._on_done(out.return_code)
+
+
 class BuildWindow(Gtk.Window):
     """构建系统主窗口"""
     
@@ -1822,28 +1986,36 @@ class BuildWindow(Gtk.Window):
         self.set_position(Gtk.WindowPosition.CENTER)
         
         self.is_building = False
-        self.build_thread: Optional[threading.Thread] = None
+        
+        # 当前任务状态（全部在GLib主循环中更新）
+        self._task_name = ""
+        self._pending_commands = collections.deque()
+        self.worker = BuildWorker(self._on_output_line, self._on_command_done)
+        
+        # 已输出行数，由状态栏定时刷新显示
+        self._line_counter = 0
+        self._status_source_id = None
+        
+        # 配置对话框在第一次打开时创建，之后复用
+        self._config_dialog = None
         
         # 创建UI
         self.create_ui()
+        self.connect("destroy", lambda widget: self.worker.stop())
     
     def create_ui(self):
         """创建用户界面"""
-        # 主垂直布局
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
-        self.add(vbox)
+        # 静态布局由GtkBuilder从UI文件创建，只加载main_box，不构造菜单栏等其他对象
+        builder = Gtk.Builder()
+        builder.add_objects_from_file(str(UI_FILE), ["main_box"])
+        self.add(builder.get_object("main_box"))
         
         # 标题
-        title_label = Gtk.Label()
+        title_label = builder.get_object("title_label")
         title_label.set_markup(f"<big><b>{PROJECT} 构建系统 v{VERSION}</b></big>")
-        title_label.set_margin_top(10)
-        title_label.set_margin_bottom(10)
-        vbox.pack_start(title_label, False, False, 0)
         
         # 按钮网格
-        button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        button_box.set_homogeneous(True)
-        vbox.pack_start(button_box, False, False, 0)
+        button_box = builder.get_object("button_box")
         
         # 创建按钮
         self.btn_config = BuildButton("配置选项", "preferences-system", self.show_config_dialog)
@@ -1859,9 +2031,7 @@ class BuildWindow(Gtk.Window):
         button_box.pack_start(self.btn_gui, True, True, 0)
         
         # 第二行按钮
-        button_box2 = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        button_box2.set_homogeneous(True)
-        vbox.pack_start(button_box2, False, False, 0)
+        button_box2 = builder.get_object("button_box2")
         
         self.btn_clean = BuildButton("清理构建", "edit-clear", self.clean_build)
         button_box2.pack_start(self.btn_clean, True, True, 0)
@@ -1873,25 +2043,11 @@ class BuildWindow(Gtk.Window):
         button_box2.pack_start(self.btn_help, True, True, 0)
         
         # 状态栏
-        self.status_bar = Gtk.Statusbar()
-        self.status_bar.set_margin_top(10)
-        self.status_bar.set_margin_bottom(10)
-        vbox.pack_start(self.status_bar, False, False, 0)
-        
-        # 日志区域
-        log_frame = Gtk.Frame(label="构建日志")
-        log_frame.set_margin_top(10)
-        vbox.pack_start(log_frame, True, True, 0)
-        
-        # 滚动窗口
-        scrolled_window = Gtk.ScrolledWindow()
-        scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled_window.set_min_content_height(300)
-        log_frame.add(scrolled_window)
+        self.status_bar = builder.get_object("status_bar")
         
         # 日志文本视图
         self.log_view = BuildLogTextView()
-        scrolled_window.add(self.log_view)
+        builder.get_object("log_scrolled_window").add(self.log_view)
         
         # 显示所有组件
         self.show_all()
@@ -1908,92 +2064,105 @@ class BuildWindow(Gtk.Window):
         self.btn_deps.set_building(building)
         self.btn_help.set_building(building)
         
-        # 更新状态栏
+        # 更新状态栏：构建期间每秒刷新一次输出行数，不在逐行路径上更新
         if building:
+            self._line_counter = 0
             self.update_status("正在构建中...", "warning")
+            if self._status_source_id is None:
+                self._status_source_id = GLib.timeout_add_seconds(1, self._tick_status)
         else:
+            if self._status_source_id is not None:
+                GLib.source_remove(self._status_source_id)
+                self._status_source_id = None
             self.update_status("就绪", "default")
     
+    def _tick_status(self):
+        """定时刷新构建进度"""
+        self.update_status(f"构建中... {self._line_counter}行", "warning")
+        return True
+    
     def update_status(self, message: str, level: str = "default"):
         """更新状态栏"""
         context_id = self.status_bar.get_context_id("build-status")
         self.status_bar.push(context_id, message)
     
-    def log(self, message: str, level: str = "info"):
+    def log(self, message: str, level: str = "info", *args):
         """添加日志"""
-        GLib.idle_add(self.log_view.log, message, level)
+        self.log_view.log(message, level, *args)
     
-    def run_command(self, command: List[str]) -> bool:
-        """运行命令"""
+    def run_command(self, command: Sequence[str]) -> bool:
+        """启动命令，输出和返回码由主循环回调处理"""
         try:
-            self.log(f"执行命令: {' '.join(command)}", "info")
-            
-            process = subprocess.Popen(
-                command,
-                cwd=ROOT_DIR,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            
-            # 实时读取输出
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self.log(output.strip(), "info")
-            
-            return_code = process.wait()
-            
-            if return_code == 0:
-                self.log("命令执行成功", "success")
-                return True
-            else:
-                self.log(f"命令执行失败，返回码: {return_code}", "error")
-                return False
-                
-        except Exception as e:
-            self.log(f"执行命令时出错: {str(e)}", "error")
+            command_line = shlex.join(command)
+            self.log("执行命令: %s", "info", command_line)
+            self.worker.run(command)
+            return True
+        except (GLib.Error, OSError) as e:
+            self.log(f"执行命令时出错: {e}", "error")
             return False
     
+    def _on_output_line(self, line: bytes):
+        """命令输出的一行"""
+        self._line_counter += 1
+        # 行已按换行符切分，只需去掉CRLF输出残留的回车
+        self.log(line.rstrip(b"\r").decode("utf-8", "replace"), "info")
+    
+    def _on_command_done(self, return_code: int):
+        """命令结束，判断结果并继续下一条命令"""
+        if return_code == 0:
+            self.log("命令执行成功", "success")
+            self._run_next_command()
+        else:
+            self.log(f"命令执行失败，返回码: {return_code}", "error")
+            self.on_build_complete(False, self._task_name)
+    
+    def _run_next_command(self):
+        """启动队列中的下一条命令"""
+        if not self._pending_commands:
+            self.on_build_complete(True, self._task_name)
+            return
+        
+        command = self._pending_commands.popleft()
+        if not self.run_command(command):
+            self.on_build_complete(False, self._task_name)
+    
     def build_console(self):
         """命令行模式构建"""
-        self.run_build_task("命令行模式构建", ["make", "clean"], ["make", "BUILD_TYPE=console"])
+        self.run_build_task("命令行模式构建", (_CMD_CONSOLE,))
     
     def build_tui(self):
         """文本GUI模式构建"""
         # 检查ncurses支持
-        try:
-            import curses
-            # 测试curses是否可用
-            curses.initscr()
-            curses.endwin()
-        except Exception as e:
-            self.log(f"错误: ncurses支持不可用 - {e}", "error")
+        if not HAS_NCURSES:
+            self.log("错误: ncurses支持不可用 - 未找到ncurses库", "error")
             self.update_status("缺少依赖", "error")
             return
         
-        self.run_build_task("文本GUI模式构建", ["make", "clean"], ["make", "BUILD_TYPE=tui"])
+        self.run_build_task("文本GUI模式构建", (_CMD_TUI,))
     
     def build_gui(self):
         """图形化GUI模式构建"""
         # GTK3依赖已在文件导入时检查，这里直接构建
-        self.run_build_task("图形化GUI模式构建", ["make", "clean"], ["make", "BUILD_TYPE=gui"])
+        self.run_build_task("图形化GUI模式构建", (_CMD_GUI,))
     
     def clean_build(self):
         """清理构建"""
-        self.run_build_task("清理构建", ["make", "clean"])
+        self.run_build_task("清理构建", (_CMD_CLEAN,))
     
     def install_deps(self):
         """安装依赖"""
-        if not os.path.exists("/etc/arch-release"):
+        if not IS_ARCH:
             self.log("错误: 此脚本仅适用于 Arch Linux", "error")
             self.update_status("不支持的系统", "error")
             return
         
-        self.run_build_task("安装依赖", ["sudo", "pacman", "-S", "--needed", "base-devel", 
-                          "git", "mingw-w64-gcc", "gnu-efi", "ncurses", "gtk3"])
+        if not HAS_PKEXEC:
+            self.log("错误: 未找到pkexec，无法在图形界面中获取管理员权限", "error")
+            self.log("请在终端中运行: make deps-arch", "info")
+            self.update_status("缺少依赖", "error")
+            return
+        
+        self.run_build_task("安装依赖", (_CMD_DEPS_ARCH,))
     
     def show_config_dialog(self):
         """显示配置对话框"""
@@ -2001,12 +2170,10 @@ class BuildWindow(Gtk.Window):
             self.log("正在构建中，无法修改配置", "warning")
             return
         
-        dialog = BuildConfigDialog(self, self)
-        response = dialog.run()
-        
-        if response in [Gtk.ResponseType.APPLY, Gtk.ResponseType.OK]:
-            self.log("配置已保存", "success")
-            self.log("需要重新编译才能使配置生效", "info")
+        if self._config_dialog is None:
+            self._config_dialog = BuildConfigDialog(self, self)
+        # 保存结果由对话框在写入完成后记录
+        self._config_dialog.run()
     
     def show_help(self):
         """显示帮助"""
@@ -2028,8 +2195,8 @@ class BuildWindow(Gtk.Window):
         help_dialog.run()
         help_dialog.destroy()
     
-    def run_build_task(self, task_name: str, *commands: List[List[str]]):
-        """运行构建任务"""
+    def run_build_task(self, task_name: str, commands: Sequence[Sequence[str]]):
+        """运行构建任务，按顺序执行commands，任一命令失败即停止"""
         if self.is_building:
             self.log("正在构建中，请等待", "warning")
             return
@@ -2038,19 +2205,9 @@ class BuildWindow(Gtk.Window):
         self.log_view.clear()
         self.log(f"开始{task_name}...", "info")
         
-        # 在后台线程中运行构建
-        def build_thread():
-            success = True
-            for cmd in commands:
-                if not self.run_command(cmd):
-                    success = False
-                    break
-            
-            # 恢复UI状态
-            GLib.idle_add(self.on_build_complete, success, task_name)
-        
-        self.build_thread = threading.Thread(target=build_thread)
-        self.build_thread.start()
+        self._task_name = task_name
+        self._pending_commands = collections.deque(commands)
+        self._run_next_command()
     
     def on_build_complete(self, success: bool, task_name: str):
         """构建完成回调"""
@@ -2066,6 +2223,7 @@ class BuildWindow(Gtk.Window):
 
 def main():
     """主函数"""
+    setup_stdio()
     app = BuildWindow()
     app.connect("destroy", Gtk.main_quit)
     Gtk.main()
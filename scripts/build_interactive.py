@@ -7,12 +7,27 @@ HIC构建系统 - 交互式CLI模式
 
 import sys
 import os
+import copy
+import subprocess
 from pathlib import Path
 
+# PyYAML只在读写platform.yaml时需要，缺少时其他功能照常可用
+try:
+    import yaml
+    # 优先使用libyaml实现的CSafeLoader/CSafeDumper
+    YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+except ImportError:
+    yaml = None
+
 # 项目信息
 PROJECT = "HIC System"
 VERSION = "0.1.0"
 ROOT_DIR = Path(__file__).parent.parent
+PLATFORM_YAML = ROOT_DIR / "platform.yaml"
+
+# YAML文件解析结果缓存: 路径 -> (st_mtime_ns, st_size, 配置)
+_YAML_CACHE = {}
 
 COLORS = {
     'reset': '\033[0m',
@@ -30,13 +45,26 @@ def print_colored(text, color='white'):
     """打印彩色文本"""
     print(f"{COLORS.get(color, '')}{text}{COLORS['reset']}")
 
+# 标题框内容固定，导入时生成一次
+HEADER = (
+    f"\n{COLORS['cyan']}╔{'═' * 50}╗\n"
+    f"║  {PROJECT} v{VERSION} - 交互式构建系统  ║\n"
+    f"╚{'═' * 50}╝{COLORS['reset']}\n"
+)
+
+# 光标移到左上角、清屏并清除回滚缓冲区（与clear命令输出相同）
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"
+
+def clear_screen():
+    """清屏，直接输出控制序列，不再每次启动clear进程"""
+    if os.name == 'nt':
+        os.system('cls')
+    elif os.environ.get('TERM') != 'dumb':
+        sys.stdout.write(CLEAR_SCREEN)
+
 def print_header():
     """打印标题"""
-    print()
-    print_colored(f"╔{'═' * 50}╗", 'cyan')
-    print_colored(f"║  {PROJECT} v{VERSION} - 交互式构建系统  ║", 'cyan')
-    print_colored(f"╚{'═' * 50}╝", 'cyan')
-    print()
+    print(HEADER)
 
 def print_menu():
     """打印主菜单"""
@@ -52,22 +80,51 @@ def print_menu():
     print("  0. 退出")
     print()
 
+# 预设菜单选项 -> 预设名称
+PRESETS = {
+    '1': 'balanced',
+    '2': 'release',
+    '3': 'debug',
+    '4': 'minimal',
+    '5': 'performance'
+}
+
+PRESET_MENU = """
+  1. balanced  - 平衡配置（推荐）
+  2. release   - 发布配置
+  3. debug     - 调试配置
+  4. minimal   - 最小配置
+  5. performance - 性能配置
+  0. 返回
+"""
+
 def show_preset_menu():
     """显示预设配置菜单"""
     print_colored("预设配置：", 'bold')
-    print()
-    print("  1. balanced  - 平衡配置（推荐）")
-    print("  2. release   - 发布配置")
-    print("  3. debug     - 调试配置")
-    print("  4. minimal   - 最小配置")
-    print("  5. performance - 性能配置")
-    print("  0. 返回")
-    print()
+    print(PRESET_MENU)
+
+def load_config(path):
+    """读取YAML配置，文件未变化时直接使用上次的解析结果
+    
+    返回副本，调用方可以随意修改，不影响缓存
+    """
+    st = path.stat()
+    cached = _YAML_CACHE.get(path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.load(f, Loader=YAML_LOADER)
+        cached = _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, config)
+    return copy.deepcopy(cached[2])
+
+def save_config(path, config):
+    """写入YAML配置并更新缓存"""
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.dump(config, f, Dumper=YAML_DUMPER, default_flow_style=False, allow_unicode=True)
+    st = path.stat()
+    _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, copy.deepcopy(config))
 
 def run_command(command, description=""):
     """运行命令"""
-    import subprocess
-    
     if description:
         print_colored(f"\n{description}...", 'yellow')
     
@@ -87,16 +144,18 @@ def show_current_config():
     print_colored("\n当前配置：", 'bold')
     print()
     
+    if yaml is None:
+        print_colored("需要安装 PyYAML", 'red')
+        return
+    
     # 显示YAML配置
-    config_file = ROOT_DIR / "platform.yaml"
+    config_file = PLATFORM_YAML
     if config_file.exists():
         print_colored(f"配置文件: {config_file}", 'cyan')
         print()
         
         try:
-            import yaml
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = load_config(config_file)
             
             # 显示关键配置
             if 'build' in config:
@@ -127,17 +186,18 @@ def show_current_config():
 
 def configure_build_options():
     """配置编译选项"""
-    import yaml
+    if yaml is None:
+        print_colored("需要安装 PyYAML", 'red')
+        return
     
-    config_file = ROOT_DIR / "platform.yaml"
+    config_file = PLATFORM_YAML
     
     if not config_file.exists():
         print_colored("配置文件不存在！", 'red')
         return
     
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = load_config(config_file)
         
         if 'build' not in config:
             config['build'] = {}
@@ -174,8 +234,7 @@ def configure_build_options():
             config['build']['lto'] = False
         
         # 保存配置
-        with open(config_file, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(config, f, default_flow_style=False, allow_unicode=True)
+        save_config(config_file, config)
         
         print_colored("\n配置已保存！", 'green')
         
@@ -184,17 +243,18 @@ def configure_build_options():
 
 def configure_features():
     """配置功能特性"""
-    import yaml
+    if yaml is None:
+        print_colored("需要安装 PyYAML", 'red')
+        return
     
-    config_file = ROOT_DIR / "platform.yaml"
+    config_file = PLATFORM_YAML
     
     if not config_file.exists():
         print_colored("配置文件不存在！", 'red')
         return
     
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = load_config(config_file)
         
         if 'features' not in config:
             config['features'] = {}
@@ -223,38 +283,12 @@ def configure_features():
                 config['features'][feature] = False
         
         # 保存配置
-        with open(config_file, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(config, f, default_flow_style=False, allow_unicode=True)
+        save_config(config_file, config)
         
         print_colored("\n配置已保存！", 'green')
         
     except Exception as e:
         print_colored(f"配置失败: {e}", 'red')
-    """选择预设配置"""
-    show_preset_menu()
-    
-    choice = input("请选择预设配置 (0-5): ").strip()
-    
-    presets = {
-        '1': 'balanced',
-        '2': 'release',
-        '3': 'debug',
-        '4': 'minimal',
-        '5': 'performance'
-    }
-    
-    if choice in presets:
-        preset = presets[choice]
-        print_colored(f"\n应用预设配置: {preset}", 'green')
-        
-        # 使用make命令应用预设
-        run_command(['make', f'build-{preset}'])
-    elif choice == '0':
-        pass
-    else:
-        print_colored("无效的选择", 'red')
-    
-    input("\n按Enter键继续...")
 
 def select_preset():
     """选择预设配置"""
@@ -262,16 +296,8 @@ def select_preset():
     
     choice = input("请选择预设配置 (0-5): ").strip()
     
-    presets = {
-        '1': 'balanced',
-        '2': 'release',
-        '3': 'debug',
-        '4': 'minimal',
-        '5': 'performance'
-    }
-    
-    if choice in presets:
-        preset = presets[choice]
+    if choice in PRESETS:
+        preset = PRESETS[choice]
         print_colored(f"\n应用预设配置: {preset}", 'green')
         
         # 使用make命令应用预设
@@ -288,13 +314,11 @@ def build():
     print()
     
     # 从命令行参数或用户输入获取构建目标
-    import sys
-    
     # 检查是否有预设参数
     if len(sys.argv) > 1:
         target_arg = sys.argv[1]
         
-        if target_arg in ['balanced', 'release', 'debug', 'minimal', 'performance']:
+        if target_arg in PRESETS.values():
             print_colored(f"使用预设配置: {target_arg}", 'green')
             print()
             success = run_command(['make', f'build-{target_arg}'])
@@ -366,10 +390,8 @@ def build():
 
 def main():
     """主函数"""
-    import subprocess
-    
     while True:
-        os.system('clear' if os.name != 'nt' else 'cls')
+        clear_screen()
         print_header()
         print_menu()
         
@@ -1,8 +1,26 @@
 #!/usr/bin/env python3
+import errno
 import os
 import subprocess
 import sys
 
+def preallocate_image(path, size):
+    """
+    预分配指定大小的镜像文件，不逐块写入零数据
+    """
+    with open(path, 'wb') as img:
+        fd = img.fileno()
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except AttributeError:
+            # 不支持fallocate的平台上退化为稀疏文件
+            os.ftruncate(fd, size)
+        except OSError as e:
+            # 文件系统不支持时同样退化为稀疏文件；磁盘已满、I/O错误等必须立即报告
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+            os.ftruncate(fd, size)
+
 def create_fat32_image(disk_path, bootloader_path, kernel_path):
     """
     创建FAT32磁盘镜像，包含UEFI引导文件和内核
@@ -46,10 +64,7 @@ def create_fat32_image(disk_path, bootloader_path, kernel_path):
             block_count = (total_size // 512) + 10000  # 增加更多空间
             
             # 创建FAT32镜像
-            subprocess.run([
-                'dd', 'if=/dev/zero', f'of={disk_path}', 
-                f'bs=512', f'count={block_count}'
-            ], check=True, stdout=subprocess.DEVNULL)
+            preallocate_image(disk_path, block_count * 512)
             
             # 格式化为FAT32
             subprocess.run([
@@ -89,7 +104,7 @@ def create_fat32_image(disk_path, bootloader_path, kernel_path):
             print(f"✓ 磁盘镜像创建成功: {disk_path}")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             print(f"错误: 创建FAT32镜像失败: {e}")
             return False
 